@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, Dict, Iterable
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .settings import settings
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class AdmissionLimiter:
+    """Concurrency limit with a bounded queue and a queue-time budget.
+
+    A request waits for a free slot at most ``queue_timeout`` seconds, and is
+    turned away at once when ``max_queue`` requests are already waiting. An
+    early 503 is cheaper for everyone than a request that would sit behind
+    SQLite until it times out anyway.
+    """
+
+    def __init__(self, limit: int, queue_timeout: float, max_queue: int) -> None:
+        self.limit = limit
+        self.queue_timeout = queue_timeout
+        self.max_queue = max_queue
+        self._semaphore = asyncio.Semaphore(limit)
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    async def acquire(self) -> bool:
+        if self._semaphore.locked():
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                return False
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                return False
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+        self.active += 1
+        self.admitted += 1
+        return True
+
+    def release(self) -> None:
+        self.active -= 1
+        self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+read_limiter = AdmissionLimiter(
+    limit=settings.read_concurrency,
+    queue_timeout=settings.read_queue_timeout_ms / 1000,
+    max_queue=settings.read_max_queue,
+)
+write_limiter = AdmissionLimiter(
+    limit=settings.write_concurrency,
+    queue_timeout=settings.write_queue_timeout_ms / 1000,
+    max_queue=settings.write_max_queue,
+)
+
+
+class AdmissionControlMiddleware:
+    """Sheds load on API routes with 503 + Retry-After once the read or write limiter is full."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        prefix: str = "/terms",
+        exempt: Iterable[str] = ("/terms/changes/stream",),
+        retry_after: int = 1,
+    ) -> None:
+        self.app = app
+        self.prefix = prefix
+        # Long-lived streams would pin a slot for their whole lifetime.
+        self.exempt = frozenset(exempt)
+        self.retry_after = retry_after
+        self._body = json.dumps({"detail": "Сервер перегружен, повторите запрос позже"}, ensure_ascii=False).encode()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope.get("path", "")
+        if scope["type"] != "http" or not path.startswith(self.prefix) or path in self.exempt:
+            await self.app(scope, receive, send)
+            return
+        limiter = read_limiter if scope["method"] in READ_METHODS else write_limiter
+        if not await limiter.acquire():
+            await self._reject(send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+    async def _reject(self, send: Send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(self._body)).encode()),
+                (b"retry-after", str(self.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": self._body})
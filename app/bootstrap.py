@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from .changes import backfill_change_log
+from .database import Base, create_all, engine, get_session, upsert, write_connection
+from .models import SchemaMeta
+from .search import FTS_SCHEMA, create_search_index, search_supported
+from .seed_data import TERMS, seed_terms
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_KEY = "schema"
+SEED_KEY = "seed"
+
+
+def _fingerprint(parts) -> str:
+    return hashlib.sha1("\n".join(parts).encode()).hexdigest()[:16]
+
+
+def schema_version() -> str:
+    """Fingerprint of the DDL for every table, index and the FTS index.
+
+    Any change to a model changes the fingerprint, so there is no version
+    number to remember to bump.
+    """
+    dialect = engine.dialect
+    ddl = []
+    for table in Base.metadata.sorted_tables:
+        ddl.append(str(CreateTable(table).compile(dialect=dialect)))
+        ddl += [str(CreateIndex(index).compile(dialect=dialect)) for index in sorted(table.indexes, key=lambda i: i.name)]
+    if search_supported():
+        ddl += FTS_SCHEMA
+    return _fingerprint(ddl)
+
+
+SEED_VERSION = _fingerprint([json.dumps(TERMS, sort_keys=True, ensure_ascii=False)])
+
+
+def _process_started() -> float:
+    """Wall-clock start of this process, so module imports count towards startup.
+
+    Linux only (``/proc``); elsewhere falls back to the time this module was imported.
+    """
+    try:
+        with open("/proc/self/stat") as f:
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return time.time() - (uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError):
+        return time.time()
+
+
+class StartupTimer:
+    """Durations of the startup phases and the time until the first request can be served."""
+
+    def __init__(self) -> None:
+        self.process_started = _process_started()
+        self.lifespan_started: Optional[float] = None
+        self.ready_at: Optional[float] = None
+        self.phases: Dict[str, float] = {}
+        self.schema = "unknown"
+        self.seed = "unknown"
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        if self.lifespan_started is None:
+            self.lifespan_started = time.time()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = round((time.perf_counter() - started) * 1000, 3)
+
+    def ready(self) -> None:
+        self.ready_at = time.time()
+        logger.info("Ready to serve in %.0f ms (%s)", self.stats()["ready_ms"], self.phases)
+
+    def stats(self) -> Dict[str, Any]:
+        def since_start(moment: Optional[float]) -> Optional[float]:
+            return round((moment - self.process_started) * 1000, 3) if moment is not None else None
+
+        return {
+            "imports_ms": since_start(self.lifespan_started),
+            "ready_ms": since_start(self.ready_at),
+            "phases_ms": self.phases,
+            "schema": self.schema,
+            "seed": self.seed,
+        }
+
+
+startup = StartupTimer()
+
+
+async def read_versions(conn: AsyncConnection) -> Dict[str, str]:
+    exists = await conn.run_sync(lambda sync_conn: inspect(sync_conn).has_table(SchemaMeta.__tablename__))
+    if not exists:
+        return {}
+    result = await conn.execute(select(SchemaMeta.key, SchemaMeta.value))
+    return dict(result.tuples().all())
+
+
+async def write_versions(conn: AsyncConnection, versions: Dict[str, str]) -> None:
+    stmt = upsert(SchemaMeta).values([{"key": key, "value": value} for key, value in versions.items()])
+    await conn.execute(stmt.on_conflict_do_update(index_elements=[SchemaMeta.key], set_={"value": stmt.excluded.value}))
+
+
+async def bootstrap_database() -> None:
+    """Create the schema and seed data unless the stored versions say they are current.
+
+    A warm boot costs one read of ``schema_meta`` without taking the write
+    lock, however large the tables are.
+    """
+    wanted = {SCHEMA_KEY: schema_version(), SEED_KEY: SEED_VERSION}
+    async with engine.connect() as conn:
+        if await read_versions(conn) == wanted:
+            startup.schema = startup.seed = "current"
+            return
+
+    # One write-locked transaction: concurrently starting workers run the
+    # schema and seed steps one after another instead of racing, and the
+    # versions are read again in case another worker has just finished.
+    async with write_connection() as conn, conn.begin():
+        versions = await read_versions(conn)
+        startup.schema = startup.seed = "current"
+        if versions.get(SCHEMA_KEY) != wanted[SCHEMA_KEY]:
+            await create_all(conn)
+            await create_search_index(conn)
+            await backfill_change_log(conn)
+            startup.schema = "migrated"
+        if versions.get(SEED_KEY) != wanted[SEED_KEY]:
+            async with get_session(bind=conn) as session:
+                await seed_terms(session)
+            startup.seed = "seeded"
+        if versions != wanted:
+            await write_versions(conn, wanted)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Iterable, List
+
+from sqlalchemy import and_, delete, func, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.orm import aliased
+
+from .models import Term, TermChange
+from .schemas import ChangeFeed, TermChangeOut, TermOut
+
+UPSERT = "upsert"
+DELETE = "delete"
+
+
+class ChangeNotifier:
+    """Wakes up every waiter once per committed change batch."""
+
+    def __init__(self) -> None:
+        self._event = asyncio.Event()
+
+    def notify(self) -> None:
+        self._event.set()
+        self._event = asyncio.Event()
+
+    def waiter(self) -> asyncio.Event:
+        # Grab the event *before* reading the log so a commit landing in
+        # between is not missed.
+        return self._event
+
+
+change_notifier = ChangeNotifier()
+
+
+async def record_changes(db: AsyncSession, upserted: Iterable[str] = (), deleted: Iterable[str] = ()) -> None:
+    """Log the writes and drop the changes they supersede.
+
+    The feed only ever returns the latest change per keyword, so the log
+    keeps one row per keyword (a delete stays as a tombstone) instead of
+    growing with every write. Versions are never reused, so a client whose
+    ``since`` is past a dropped row sees the new one instead.
+    """
+    rows = [{"keyword": keyword, "op": UPSERT} for keyword in upserted]
+    rows += [{"keyword": keyword, "op": DELETE} for keyword in deleted]
+    if rows:
+        table = TermChange.__table__
+        await db.execute(delete(table).where(table.c.keyword.in_([row["keyword"] for row in rows])))
+        await db.execute(insert(table), rows)
+
+
+async def backfill_change_log(conn: AsyncConnection) -> None:
+    """Seed an empty change log with the existing terms so ``since=0`` returns everything."""
+    if (await conn.execute(select(TermChange.version).limit(1))).first() is not None:
+        return
+    await conn.execute(
+        insert(TermChange.__table__).from_select(
+            ["keyword", "op", "changed_at"],
+            select(Term.keyword, literal(UPSERT), Term.updated_at).order_by(Term.id),
+        )
+    )
+
+
+async def head_version(db: AsyncSession) -> int:
+    return (await db.execute(select(func.max(TermChange.version)))).scalar() or 0
+
+
+async def load_changes(db: AsyncSession, since: int, limit: int) -> ChangeFeed:
+    """Latest change per keyword after ``since``, in version order.
+
+    Older changes to a keyword that changed again are skipped, so a client
+    applying the feed in order ends up with the current state of the table.
+    record_changes prunes them as it goes; the check covers logs written
+    before it did.
+    """
+    later = aliased(TermChange)
+    superseded = select(later.version).where(
+        and_(later.keyword == TermChange.keyword, later.version > TermChange.version)
+    ).exists()
+    stmt = (
+        select(TermChange, Term)
+        .outerjoin(Term, and_(Term.keyword == TermChange.keyword, TermChange.op == UPSERT))
+        .where(TermChange.version > since, ~superseded)
+        .order_by(TermChange.version)
+        .limit(limit + 1)
+    )
+    rows = (await db.execute(stmt)).all()
+    has_more = len(rows) > limit
+    changes: List[TermChangeOut] = [
+        TermChangeOut(
+            version=change.version,
+            op=change.op,
+            keyword=change.keyword,
+            changed_at=change.changed_at,
+            term=TermOut.model_validate(term) if term is not None else None,
+        )
+        for change, term in rows[:limit]
+    ]
+    if has_more:
+        version = changes[-1].version
+    else:
+        version = max(since, await head_version(db))
+    return ChangeFeed(version=version, has_more=has_more, changes=changes)
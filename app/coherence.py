@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .database import IS_SQLITE, engine
+
+logger = logging.getLogger(__name__)
+
+ChangeListener = Callable[[], Awaitable[None]]
+
+RECONNECT_DELAY = 1.0
+
+
+class ChangeWatcher:
+    """Detects commits made by other processes sharing the SQLite database.
+
+    ``PRAGMA data_version`` changes whenever another connection commits, so
+    one dedicated connection polls it every ``interval`` seconds and, on a
+    change, runs the registered listeners (cache invalidation, index reload).
+    With several uvicorn workers this bounds how long a worker can serve data
+    that another worker has already overwritten.
+
+    If the connection or a poll fails, the watcher logs it and reconnects.
+    Commits made in between cannot be detected, so the listeners run once
+    after every reconnect.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.polls = 0
+        self.changes = 0
+        self.failures = 0
+        self._listeners: List[ChangeListener] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def add_listener(self, listener: ChangeListener) -> None:
+        self._listeners.append(listener)
+
+    async def start(self) -> None:
+        if not IS_SQLITE:
+            logger.warning("Cross-process change detection needs SQLite; workers will rely on cache TTL")
+            return
+        self._task = asyncio.create_task(self._run(), name="glossary-change-watcher")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def _run(self) -> None:
+        reconnected = False
+        while True:
+            try:
+                async with engine.connect() as conn:
+                    # Query the driver connection directly: going through SQLAlchemy
+                    # would wrap every poll in BEGIN/ROLLBACK.
+                    raw = await conn.get_raw_connection()
+                    driver = raw.driver_connection
+                    version = await self._data_version(driver)
+                    if reconnected:
+                        await self._notify()
+                    while True:
+                        await asyncio.sleep(self.interval)
+                        self.polls += 1
+                        current = await self._data_version(driver)
+                        if current == version:
+                            continue
+                        version = current
+                        self.changes += 1
+                        await self._notify()
+            except Exception:
+                self.failures += 1
+                logger.exception("Change watcher failed; reconnecting in %.1f s", RECONNECT_DELAY)
+                reconnected = True
+                await asyncio.sleep(RECONNECT_DELAY)
+
+    async def _notify(self) -> None:
+        for listener in self._listeners:
+            try:
+                await listener()
+            except Exception:
+                logger.exception("Change listener %r failed", listener)
+
+    @staticmethod
+    async def _data_version(driver) -> int:
+        cursor = await driver.execute("PRAGMA data_version")
+        try:
+            (version,) = await cursor.fetchone()
+        finally:
+            await cursor.close()
+        return version
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "interval_ms": self.interval * 1000,
+            "polls": self.polls,
+            "changes": self.changes,
+            "failures": self.failures,
+        }
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import zlib
+from typing import Callable, Dict, NamedTuple, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .profiling import phase
+from .settings import settings
+
+try:
+    import zstandard
+except ImportError:  # optional: pip install zstandard
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+
+class StreamCompressor:
+    """Incremental compressor: ``compress`` per chunk, ``flush`` once at the end."""
+
+    def __init__(self, compress: Callable[[bytes], bytes], flush: Callable[[], bytes]) -> None:
+        self.compress = compress
+        self.flush = flush
+
+
+class Codec(NamedTuple):
+    name: str
+    stream: Callable[[], StreamCompressor]
+
+    def compress(self, body: bytes) -> bytes:
+        compressor = self.stream()
+        return compressor.compress(body) + compressor.flush()
+
+
+def _gzip_stream() -> StreamCompressor:
+    # wbits=31 writes a gzip header; zlib releases the GIL on large inputs.
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    return StreamCompressor(compressor.compress, compressor.flush)
+
+
+def _zstd_stream() -> StreamCompressor:
+    compressor = zstandard.ZstdCompressor(level=3).compressobj()
+    return StreamCompressor(compressor.compress, compressor.flush)
+
+
+def _brotli_stream() -> StreamCompressor:
+    # Quality 4-5 is the usual choice for dynamic responses; 11 is far slower.
+    compressor = brotli.Compressor(quality=4)
+    return StreamCompressor(compressor.process, compressor.finish)
+
+
+# Server preference when the client accepts several with the same q-value.
+CODECS: Dict[str, Codec] = {
+    codec.name: codec
+    for codec in (
+        Codec("zstd", _zstd_stream) if zstandard is not None else None,
+        Codec("br", _brotli_stream) if brotli is not None else None,
+        Codec("gzip", _gzip_stream),
+    )
+    if codec is not None
+}
+
+# Streaming these would make the client wait for a compressor flush.
+UNCOMPRESSED_TYPES = ("text/event-stream",)
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """Best available encoding allowed by an ``Accept-Encoding`` header, or None for identity."""
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        q = 1.0
+        params = params.strip().replace(" ", "")
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+    best, best_q = None, 0.0
+    for name in CODECS:
+        q = weights.get(name, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+class CompressionMiddleware:
+    """Negotiated gzip/zstd/brotli for responses of at least ``minimum_size`` bytes.
+
+    Responses that already carry Content-Encoding (the precompressed bodies
+    from the read cache) and event streams pass through untouched. Streaming
+    responses are compressed chunk by chunk.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressedResponder(self.app, CODECS[encoding], self.minimum_size)(scope, receive, send)
+
+
+class _CompressedResponder:
+    def __init__(self, app: ASGIApp, codec: Codec, minimum_size: int) -> None:
+        self.app = app
+        self.codec = codec
+        self.minimum_size = minimum_size
+        self.start: Optional[Message] = None
+        self.compressor: Optional[StreamCompressor] = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_wrapper)
+
+    async def send_wrapper(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = "content-encoding" in headers or content_type.startswith(UNCOMPRESSED_TYPES)
+            if self.passthrough:
+                await self.send(message)
+            else:
+                # Held back until the first body chunk shows whether it is worth compressing.
+                self.start = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is not None:
+            start, self.start = self.start, None
+            if not more_body and len(body) < self.minimum_size:
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+            headers = MutableHeaders(raw=start["headers"])
+            headers["Content-Encoding"] = self.codec.name
+            headers.add_vary_header("Accept-Encoding")
+            if "etag" in headers:
+                headers["ETag"] = encoding_etag(headers["etag"], self.codec.name)
+            self.compressor = self.codec.stream()
+            if more_body:
+                del headers["Content-Length"]
+                await self.send(start)
+            else:
+                body = self.compressor.compress(body) + self.compressor.flush()
+                headers["Content-Length"] = str(len(body))
+                await self.send(start)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+
+        chunk = self.compressor.compress(body)
+        if not more_body:
+            chunk += self.compressor.flush()
+        if chunk or not more_body:
+            await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+
+def encoding_etag(etag: str, encoding: Optional[str]) -> str:
+    """Strong ETag of one content-coding of a body: ``"<hash>"`` becomes ``"<hash>-gzip"``.
+
+    A strong validator has to differ between encodings of the same body;
+    weak ones may be shared and are returned unchanged.
+    """
+    if encoding is None or etag.startswith("W/"):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def body_encoding(body: bytes, accept_encoding: Optional[str]) -> Optional[str]:
+    """Encoding to send a cached body with, or None to send it as is."""
+    if not settings.compression_enabled or len(body) < settings.compression_min_size:
+        return None
+    return negotiate(accept_encoding)
+
+
+def encoded_body(compressed: Dict[str, bytes], body: bytes, encoding: str) -> bytes:
+    """Compress a cached body once per encoding.
+
+    ``compressed`` lives on the cached entry, so a compressed variant is
+    reused until the next write invalidates the entry it belongs to.
+    """
+    data = compressed.get(encoding)
+    if data is None:
+        with phase("compress"):
+            data = compressed[encoding] = CODECS[encoding].compress(body)
+    return data
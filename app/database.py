@@ -1,25 +1,142 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import reprlib
+import time
 from contextlib import asynccontextmanager
-from typing import AsyncIterator
+from typing import Any, AsyncIterator, Callable, List, Optional
 
+from sqlalchemy import event, text
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from . import profiling
+from .metrics import metrics, statement_type
+from .settings import settings
+
+slow_query_logger = logging.getLogger("app.slow_queries")
 
 
 class Base(DeclarativeBase):
     pass
 
 
-SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./glossary.db"
+SQLALCHEMY_DATABASE_URL = settings.database_url
+IS_SQLITE = SQLALCHEMY_DATABASE_URL.startswith("sqlite")
+
+
+PROFILING = settings.profiling_enabled or settings.profiling_sample_rate > 0
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection.
+
+    The pool has no event that fires *before* a checkout starts, so the wait
+    is measured around ``_do_get`` (queue wait plus connect on overflow).
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            elapsed = time.perf_counter() - started
+            if settings.metrics_enabled:
+                metrics.observe("glossary_db_pool_checkout_seconds", elapsed)
+            profiling.record("pool", elapsed)
+
+
+# aiosqlite defaults to NullPool (a new connection, and PRAGMA setup, per
+# session); a real queue pool keeps connections warm for every backend.
 engine: AsyncEngine = create_async_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+    SQLALCHEMY_DATABASE_URL,
+    poolclass=TimedQueuePool if settings.metrics_enabled or PROFILING else AsyncAdaptedQueuePool,
+    pool_size=settings.pool_size,
+    max_overflow=settings.max_overflow,
+    pool_timeout=settings.pool_timeout,
+    connect_args={"check_same_thread": False} if IS_SQLITE else {},
 )
+if IS_SQLITE:
+    SQLITE_PRAGMAS = {
+        "journal_mode": settings.sqlite_journal_mode,
+        "synchronous": settings.sqlite_synchronous,
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+        "cache_size": settings.sqlite_cache_size,
+        "mmap_size": settings.sqlite_mmap_size,
+    }
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _sqlite_on_connect(dbapi_connection, connection_record) -> None:
+        # pysqlite/aiosqlite emit BEGIN lazily and break SAVEPOINT semantics;
+        # let SQLAlchemy issue BEGIN itself so begin_nested() works as expected.
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _sqlite_begin(conn) -> None:
+        if conn.get_execution_options().get("write_lock"):
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+        else:
+            conn.exec_driver_sql("BEGIN")
+
+
+StatementObserver = Callable[[str, Any, float], None]
+
+
+def _observe_metrics(statement: str, parameters: Any, elapsed: float) -> None:
+    metrics.observe("glossary_db_statement_duration_seconds", elapsed, (("statement", statement_type(statement)),))
+
+
+def _log_slow_query(statement: str, parameters: Any, elapsed: float) -> None:
+    if elapsed * 1000 >= settings.slow_query_ms:
+        slow_query_logger.warning(
+            "Slow query (%.1f ms): %s; parameters: %s",
+            elapsed * 1000, " ".join(statement.split()), reprlib.repr(parameters),
+        )
+
+
+# Each consumer of statement timings is registered only when enabled; with
+# none of them the cursor events are not listened to at all.
+_statement_observers: List[StatementObserver] = []
+if settings.metrics_enabled:
+    _statement_observers.append(_observe_metrics)
+if settings.slow_query_ms > 0:
+    _statement_observers.append(_log_slow_query)
+if PROFILING:
+    _statement_observers.append(profiling.record_statement)
+
+if _statement_observers:
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _statement_started(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("statement_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _statement_finished(conn, cursor, statement, parameters, context, executemany) -> None:
+        elapsed = time.perf_counter() - conn.info["statement_started"].pop()
+        for observer in _statement_observers:
+            observer(statement, parameters, elapsed)
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def _statement_failed(context) -> None:
+        # after_cursor_execute does not fire for a failed statement.
+        started = context.connection.info.get("statement_started") if context.connection is not None else None
+        if started:
+            started.pop()
+
+
 SessionLocal = async_sessionmaker(
     bind=engine,
     expire_on_commit=False,
@@ -30,11 +147,12 @@ SessionLocal = async_sessionmaker(
 
 
 @asynccontextmanager
-async def get_session() -> AsyncIterator[AsyncSession]:
-    session: AsyncSession = SessionLocal()
+async def get_session(bind: Optional[AsyncConnection] = None) -> AsyncIterator[AsyncSession]:
+    session: AsyncSession = SessionLocal() if bind is None else SessionLocal(bind=bind)
     try:
         yield session
-        await session.commit()
+        with profiling.phase("commit"):
+            await session.commit()
     except Exception:
         await session.rollback()
         raise
@@ -42,7 +160,64 @@ async def get_session() -> AsyncIterator[AsyncSession]:
         await session.close()
 
 
-async def create_all() -> None:
-    """Create database tables asynchronously."""
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+def upsert(model):
+    """Dialect-specific INSERT that supports ``ON CONFLICT`` clauses."""
+    if IS_SQLITE:
+        return sqlite.insert(model)
+    return postgresql.insert(model)
+
+
+def on_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    """Run ``callback`` once the session's current transaction is committed."""
+    session.info.setdefault("on_commit", []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_on_commit(session: Session) -> None:
+    for callback in session.info.pop("on_commit", ()):
+        callback()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_on_commit(session: Session, previous_transaction) -> None:
+    # A rolled back SAVEPOINT only undoes its own work; callbacks registered
+    # by other statements of the outer transaction must still run. The
+    # writer drops the callbacks of a failed op itself (WriteQueue._execute).
+    if not previous_transaction.nested:
+        session.info.pop("on_commit", None)
+
+
+def _create_schema(connection) -> None:
+    Base.metadata.create_all(connection)
+    # create_all() skips tables that already exist, so indexes added to a
+    # model later have to be created explicitly on existing databases.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
+@asynccontextmanager
+async def write_connection() -> AsyncIterator[AsyncConnection]:
+    """Connection whose transactions take the database write lock up front.
+
+    On SQLite this emits ``BEGIN IMMEDIATE``: with several processes writing,
+    a deferred transaction that upgrades from read to write can fail with
+    ``database is locked`` instead of waiting for ``busy_timeout``.
+    """
+    async with engine.connect() as conn:
+        yield await conn.execution_options(write_lock=True)
+
+
+async def create_all(conn: AsyncConnection) -> None:
+    """Create database tables and any missing indexes asynchronously."""
+    await conn.run_sync(_create_schema)
+
+
+async def warm_up_pool() -> None:
+    """Open ``pool_size`` connections up front so first requests skip connect and PRAGMA setup."""
+
+    async def ping() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(ping() for _ in range(settings.pool_size)))
@@ -3,18 +3,60 @@ from __future__ import annotations
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import PlainTextResponse, RedirectResponse
 
-from .database import create_all, get_session
+from .admission import AdmissionControlMiddleware, read_limiter, write_limiter
+from .bootstrap import bootstrap_database, startup
+from .cache import terms_cache
+from .changes import change_notifier
+from .coherence import ChangeWatcher
+from .compression import CODECS, CompressionMiddleware
+from .database import IS_SQLITE, engine, warm_up_pool
+from .metrics import MetricsMiddleware, metrics
+from .profiling import ProfilingMiddleware
 from .routers import router as terms_router
-from .seed_data import seed_terms
+from .settings import settings
+from .singleflight import read_flight
+from .suggest import (
+    start_loading_suggest_index,
+    stop_loading_suggest_index,
+    suggest_index,
+    sync_suggest_index,
+)
+from .writer import writer
+
+change_watcher = ChangeWatcher(interval=settings.change_poll_interval_ms / 1000)
+
+
+async def on_external_change() -> None:
+    terms_cache.invalidate()
+    await sync_suggest_index()
+    change_notifier.notify()
+
+
+change_watcher.add_listener(on_external_change)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await create_all()
-    async with get_session() as session:
-        await seed_terms(session)
+    with startup.phase("bootstrap"):
+        await bootstrap_database()
+    # Loading the suggest index grows with the table; it runs after startup
+    # and GET /terms/suggest waits for it.
+    start_loading_suggest_index()
+    with startup.phase("pool_warm_up"):
+        await warm_up_pool()
+    await writer.start()
+    # Always on for SQLite: the poll is cheap, and coherence must not depend on
+    # GLOSSARY_WORKERS matching uvicorn's --workers (other processes, such as
+    # a second deployment or a maintenance script, may write too).
+    if IS_SQLITE or settings.workers > 1:
+        await change_watcher.start()
+    startup.ready()
     yield
+    await change_watcher.stop()
+    await stop_loading_suggest_index()
+    await writer.stop()
 
 app = FastAPI(
     title="Глоссарий паттернов",
@@ -23,6 +65,14 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Innermost: cached list bodies arrive already compressed (see json_response)
+# and are passed through; everything else above the threshold is compressed here.
+if settings.compression_enabled:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_min_size)
+
+# Admission control sits inside CORS so that 503 responses carry CORS headers too
+app.add_middleware(AdmissionControlMiddleware, retry_after=settings.retry_after_seconds)
+
 # CORS for local dev and demos
 app.add_middleware(
     CORSMiddleware,
@@ -30,8 +80,27 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "Server-Timing"],
 )
 
+# Outside CORS and the rest, so Server-Timing covers the whole request
+if settings.profiling_enabled or settings.profiling_sample_rate > 0:
+    app.add_middleware(
+        ProfilingMiddleware,
+        header_enabled=settings.profiling_enabled,
+        sample_rate=settings.profiling_sample_rate,
+        dump_dir=settings.profiling_dump_dir,
+    )
+
+# Outermost, so the latency includes every other middleware and shed requests are counted
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+    metrics.gauge("glossary_startup_ready_seconds", "Process start to ready to serve requests.", lambda: (startup.stats()["ready_ms"] or 0) / 1000)
+    metrics.gauge("glossary_db_pool_checked_out", "Connections currently checked out of the pool.", lambda: engine.pool.checkedout())
+    metrics.gauge("glossary_write_queue_depth", "Writes waiting for the single writer.", lambda: writer.stats()["depth"])
+    metrics.gauge("glossary_admission_read_waiting", "Reads waiting for an admission slot.", lambda: read_limiter.waiting)
+    metrics.gauge("glossary_admission_write_waiting", "Writes waiting for an admission slot.", lambda: write_limiter.waiting)
+
 
 
 
@@ -40,4 +109,23 @@ async def root():
     return RedirectResponse(url="/docs")
 
 
+@app.get("/stats", tags=["service"])
+async def stats():
+    return {
+        "cache": terms_cache.stats(),
+        "compression": {"enabled": settings.compression_enabled, "encodings": list(CODECS)},
+        "admission": {"read": read_limiter.stats(), "write": write_limiter.stats()},
+        "single_flight": read_flight.stats(),
+        "writer": writer.stats(),
+        "suggest_index": {"terms": len(suggest_index), "load_ms": suggest_index.load_ms},
+        "change_watcher": change_watcher.stats(),
+        "startup": startup.stats(),
+    }
+
+
+@app.get("/metrics", tags=["service"], response_class=PlainTextResponse)
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 app.include_router(terms_router)
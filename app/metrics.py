@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+Labels = Tuple[Tuple[str, str], ...]
+
+HTTP_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Counters and histograms rendered in the Prometheus text format.
+
+    Everything is updated from the event loop thread (or, for engine events,
+    from a greenlet running on it), so plain dicts are enough and an
+    observation costs one bisect and a few additions.
+    """
+
+    def __init__(self) -> None:
+        self._counters: Dict[str, Tuple[str, Dict[Labels, float]]] = {}
+        self._histograms: Dict[str, Tuple[str, Sequence[float], Dict[Labels, Histogram]]] = {}
+        self._gauges: Dict[str, Tuple[str, Callable[[], float]]] = {}
+
+    def counter(self, name: str, help: str) -> None:
+        self._counters.setdefault(name, (help, {}))
+
+    def histogram(self, name: str, help: str, buckets: Sequence[float]) -> None:
+        self._histograms.setdefault(name, (help, buckets, {}))
+
+    def gauge(self, name: str, help: str, fn: Callable[[], float]) -> None:
+        self._gauges[name] = (help, fn)
+
+    def inc(self, name: str, labels: Labels = (), value: float = 1) -> None:
+        series = self._counters[name][1]
+        series[labels] = series.get(labels, 0) + value
+
+    def observe(self, name: str, value: float, labels: Labels = ()) -> None:
+        _, buckets, series = self._histograms[name]
+        histogram = series.get(labels)
+        if histogram is None:
+            histogram = series[labels] = Histogram(buckets)
+        histogram.observe(value)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for name, (help, series) in self._counters.items():
+            lines += [f"# HELP {name} {help}", f"# TYPE {name} counter"]
+            for labels, value in series.items():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        for name, (help, buckets, series) in self._histograms.items():
+            lines += [f"# HELP {name} {help}", f"# TYPE {name} histogram"]
+            for labels, histogram in series.items():
+                cumulative = 0
+                for bound, count in zip(buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', _format_value(bound)),))} {cumulative}")
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {histogram.count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+                lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        for name, (help, fn) in self._gauges.items():
+            lines += [f"# HELP {name} {help}", f"# TYPE {name} gauge", f"{name} {_format_value(fn())}"]
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+metrics = MetricsRegistry()
+metrics.counter("glossary_http_requests_total", "HTTP requests by route template and status code.")
+metrics.histogram("glossary_http_request_duration_seconds", "HTTP request latency by route template.", HTTP_BUCKETS)
+metrics.histogram("glossary_db_statement_duration_seconds", "Database statement execution time by statement type.", DB_BUCKETS)
+metrics.histogram("glossary_db_pool_checkout_seconds", "Time spent waiting for a pooled database connection.", DB_BUCKETS)
+
+
+def statement_type(statement: str) -> str:
+    head = statement.lstrip()[:16].split(None, 1)
+    return head[0].upper() if head else "UNKNOWN"
+
+
+def route_template(scope: Scope) -> str:
+    """Path template of the matched route, so ``/terms/{keyword}`` is one series rather than one per keyword."""
+    route = scope.get("route")
+    if route is None:
+        # Requests answered before routing (admission control 503s, CORS
+        # preflights) never got a route; match it here, off the hot path.
+        app = scope.get("app")
+        for candidate in getattr(getattr(app, "router", None), "routes", ()):
+            match, _ = candidate.matches(scope)
+            if match is Match.FULL:
+                route = candidate
+                break
+    return getattr(route, "path", UNMATCHED_ROUTE) if route is not None else UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Records request count, status code and latency per route template."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            route = route_template(scope)
+            method = scope["method"]
+            metrics.inc("glossary_http_requests_total", (("method", method), ("route", route), ("status", str(status))))
+            metrics.observe("glossary_http_request_duration_seconds", elapsed, (("method", method), ("route", route)))
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import String, Text, DateTime, Integer, UniqueConstraint
+from sqlalchemy import String, Text, DateTime, Integer, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .database import Base
@@ -10,7 +10,11 @@ from .database import Base
 
 class Term(Base):
     __tablename__ = "terms"
-    __table_args__ = (UniqueConstraint("keyword", name="uq_terms_keyword"),)
+    __table_args__ = (
+        UniqueConstraint("keyword", name="uq_terms_keyword"),
+        # Keyset pagination over GET /terms walks (title, id) in order.
+        Index("ix_terms_title_id", "title", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     keyword: Mapped[str] = mapped_column(String(128), nullable=False)
@@ -20,3 +24,28 @@ class Term(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
+
+
+class TermChange(Base):
+    """Latest write per keyword; ``version`` orders the change feed."""
+
+    __tablename__ = "term_changes"
+    __table_args__ = (
+        # Compacting the feed looks up the latest change per keyword.
+        Index("ix_term_changes_keyword_version", "keyword", "version"),
+        {"sqlite_autoincrement": True},
+    )
+
+    version: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    keyword: Mapped[str] = mapped_column(String(128), nullable=False)
+    op: Mapped[str] = mapped_column(String(8), nullable=False)
+    changed_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class SchemaMeta(Base):
+    """Schema and seed versions the database was last bootstrapped with."""
+
+    __tablename__ = "schema_meta"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    value: Mapped[str] = mapped_column(String(128), nullable=False)
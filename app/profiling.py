@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import logging
+import pstats
+import random
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from pathlib import Path
+from typing import ContextManager, Dict, Iterator, Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+
+_current: ContextVar[Optional["RequestProfile"]] = ContextVar("glossary_request_profile", default=None)
+_NOOP = nullcontext()
+
+
+class RequestProfile:
+    """Time spent per phase (session, SQL, hydration, validation, encoding, ...) within one request."""
+
+    __slots__ = ("phases", "statements")
+
+    def __init__(self) -> None:
+        self.phases: Dict[str, float] = {}
+        self.statements = 0
+
+    def add(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def server_timing(self, total: float) -> str:
+        entries = [f"total;dur={total * 1000:.3f}"]
+        for name, seconds in self.phases.items():
+            entry = f"{name};dur={seconds * 1000:.3f}"
+            if name == "sql":
+                entry += f';desc="{self.statements} statements"'
+            entries.append(entry)
+        return ", ".join(entries)
+
+
+class _Phase:
+    __slots__ = ("profile", "name", "started")
+
+    def __init__(self, profile: RequestProfile, name: str) -> None:
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self.profile.add(self.name, time.perf_counter() - self.started)
+
+
+def current_profile() -> Optional[RequestProfile]:
+    return _current.get()
+
+
+def phase(name: str) -> ContextManager[None]:
+    """Time a block as ``name`` in the current request's profile; a shared no-op when not profiling."""
+    profile = _current.get()
+    if profile is None:
+        return _NOOP
+    return _Phase(profile, name)
+
+
+def record(name: str, seconds: float) -> None:
+    profile = _current.get()
+    if profile is not None:
+        profile.add(name, seconds)
+
+
+def record_statement(statement: str, parameters, seconds: float) -> None:
+    """Cursor-event observer (see app/database.py): SQL time of the current request."""
+    profile = _current.get()
+    if profile is not None:
+        profile.add("sql", seconds)
+        profile.statements += 1
+
+
+@contextmanager
+def use_profile(profile: Optional[RequestProfile]) -> Iterator[None]:
+    """Attribute work done by another task (the single writer) to ``profile``."""
+    token = _current.set(profile)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+class ProfilingMiddleware:
+    """Profiles requests sent with ``X-Profile`` or picked at ``sample_rate``.
+
+    The phase breakdown goes into a ``Server-Timing`` response header and the
+    log. ``X-Profile: cprofile`` and sampled requests also write a cProfile
+    dump (``.prof`` plus a text summary) to ``dump_dir`` when one is set. The
+    profiler sees the whole event loop thread, so concurrent requests show up
+    in the dump too; only one request is profiled with cProfile at a time.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        header_enabled: bool = False,
+        sample_rate: float = 0.0,
+        dump_dir: Optional[str] = None,
+    ) -> None:
+        self.app = app
+        self.header_enabled = header_enabled
+        self.sample_rate = sample_rate
+        self.dump_dir = Path(dump_dir) if dump_dir else None
+        self._cprofile_busy = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        requested = None
+        if self.header_enabled:
+            requested = next((value for name, value in scope["headers"] if name == PROFILE_HEADER), None)
+        sampled = requested is None and self.sample_rate > 0 and random.random() < self.sample_rate
+        if requested is None and not sampled:
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _current.set(profile)
+        profiler = None
+        if self.dump_dir is not None and (sampled or requested == b"cprofile") and not self._cprofile_busy:
+            self._cprofile_busy = True
+            profiler = cProfile.Profile()
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(raw=message["headers"])
+                headers.append("Server-Timing", profile.server_timing(time.perf_counter() - started))
+            await send(message)
+
+        try:
+            if profiler is not None:
+                profiler.enable()
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                self._cprofile_busy = False
+            _current.reset(token)
+            total = time.perf_counter() - started
+            logger.info(
+                "Profile %s %s -> %s in %.1f ms: %s",
+                scope["method"], scope["path"], status, total * 1000,
+                ", ".join(f"{name}={seconds * 1000:.1f}ms" for name, seconds in profile.phases.items()),
+            )
+            if profiler is not None:
+                self._dump(profiler, scope)
+
+    def _dump(self, profiler: cProfile.Profile, scope: Scope) -> None:
+        self.dump_dir.mkdir(parents=True, exist_ok=True)
+        slug = scope["path"].strip("/").replace("/", "_") or "root"
+        path = self.dump_dir / f"{time.strftime('%Y%m%d-%H%M%S')}-{time.time_ns() % 10**9:09d}-{scope['method']}-{slug[:64]}"
+        profiler.dump_stats(f"{path}.prof")
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(40)
+        Path(f"{path}.txt").write_text(summary.getvalue())
+        logger.info("cProfile dump written to %s.prof", path)
@@ -1,72 +1,634 @@
 from __future__ import annotations
 
-from typing import List, AsyncIterator
+import asyncio
+import base64
+import hashlib
+import json
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, AsyncIterator, NamedTuple, Optional, Tuple, TypeVar, Union
 
-from fastapi import APIRouter, HTTPException, status, Depends
-from sqlalchemy import select
+from fastapi import APIRouter, HTTPException, Header, Query, Request, Response, status, Depends
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import bindparam, delete, func, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .database import get_session
+from .cache import terms_cache
+from .changes import change_notifier, load_changes, record_changes
+from .compression import body_encoding, encoded_body, encoding_etag
+from .database import get_session, on_commit, upsert
 from .models import Term
-from .schemas import TermCreate, TermOut, TermUpdate
+from .profiling import phase
+from .schemas import (
+    BulkItemResult,
+    BulkResult,
+    ChangeFeed,
+    ImportLineError,
+    ImportResult,
+    TermBulkCreate,
+    TermBulkDelete,
+    TermBulkUpdate,
+    TermCreate,
+    TermMultiGet,
+    TermOut,
+    TermSearchHit,
+    TermSuggestion,
+    TermUpdate,
+)
+from .search import search_supported, search_terms
+from .settings import settings
+from .singleflight import read_flight
+from .suggest import suggest_index, suggest_index_ready
+from .writer import writer
 
 router = APIRouter(prefix="/terms", tags=["terms"])
 
+T = TypeVar("T")
+
+MAX_PAGE_SIZE = 500
+MAX_MULTI_GET = 100
+EXPORT_BATCH_SIZE = 500
+IMPORT_BATCH_SIZE = 500
+MAX_CHANGES_PAGE = 1000
+# Largest value SQLite binds as an INTEGER; larger versions overflow.
+MAX_CHANGE_VERSION = 2**63 - 1
+SSE_HEARTBEAT_SECONDS = 15.0
+MAX_IMPORT_ERRORS = 100
+MAX_IMPORT_LINE = 64 * 1024
+TERM_FIELDS = tuple(TermOut.model_fields)
+TERM_COLUMNS = tuple(Term.__table__.c[name] for name in TERM_FIELDS)
+
+_term_adapter = TypeAdapter(TermOut)
+_term_list_adapter = TypeAdapter(List[TermOut])
+_row_list_adapter = TypeAdapter(List[Dict[str, Any]])
+_row_adapter = TypeAdapter(Dict[str, Any])
+_keyword_list_adapter = TypeAdapter(List[str])
+
+
+class SerializedBody(NamedTuple):
+    body: bytes
+    etag: str
+    next_cursor: Optional[str] = None
+    # Compressed variants by encoding, filled on first use (see json_response).
+    compressed: Optional[Dict[str, bytes]] = None
+
+
+def make_body(body: bytes, next_cursor: Optional[str] = None) -> SerializedBody:
+    return SerializedBody(body, '"%s"' % hashlib.sha1(body).hexdigest(), next_cursor, {})
+
+
+def serialize(adapter: TypeAdapter, value, next_cursor: Optional[str] = None) -> SerializedBody:
+    with phase("validate"):
+        value = adapter.validate_python(value, from_attributes=True)
+    with phase("serialize"):
+        return make_body(adapter.dump_json(value), next_cursor)
+
+
+def serialize_row(row) -> bytes:
+    # Fast read path: a Core row selected with exactly TERM_COLUMNS already
+    # has TermOut's fields in TermOut's order, so it is dumped as-is without
+    # ORM hydration or another round of Pydantic validation.
+    return _row_adapter.dump_json(row._asdict())
+
+
+def encode_cursor(title: str, term_id: int) -> str:
+    raw = json.dumps([title, term_id], ensure_ascii=False).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        title, term_id = json.loads(raw)
+        # bool is an int subclass; ids past the SQLite INTEGER range overflow when bound.
+        if isinstance(title, str) and type(term_id) is int and 0 <= term_id <= MAX_CHANGE_VERSION:
+            return title, term_id
+    except (TypeError, ValueError):
+        pass
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Некорректный cursor")
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested.difference(TERM_FIELDS)
+    if not requested or unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Недопустимые поля: {fields!r}; доступны: {', '.join(TERM_FIELDS)}",
+        )
+    return tuple(name for name in TERM_FIELDS if name in requested)
+
+
+async def load_term_list(
+    db: AsyncSession,
+    limit: Optional[int],
+    after: Optional[Tuple[str, int]],
+    fields: Optional[Tuple[str, ...]],
+) -> SerializedBody:
+    orm = fields is None and not settings.fast_read_path
+    if orm:
+        stmt = select(Term)
+    else:
+        # title and id are always selected: they form the next-page cursor.
+        columns = dict.fromkeys((fields or TERM_FIELDS) + ("title", "id"))
+        stmt = select(*(Term.__table__.c[name] for name in columns))
+    stmt = stmt.order_by(Term.title.asc(), Term.id.asc())
+    if after is not None:
+        stmt = stmt.where(tuple_(Term.title, Term.id) > tuple_(*after))
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+
+    # The async result is prebuffered: "query" covers SQL, row fetching and
+    # ORM hydration, the SQL alone is reported separately as "sql".
+    with phase("query"):
+        result = await db.execute(stmt)
+        rows = result.scalars().all() if orm else result.all()
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].title, rows[-1].id)
+    if orm:
+        return serialize(_term_list_adapter, rows, next_cursor)
+    with phase("serialize"):
+        if fields is None:
+            items = [row._asdict() for row in rows]
+        else:
+            items = [{name: row._mapping[name] for name in fields} for row in rows]
+        return make_body(_row_list_adapter.dump_json(items), next_cursor)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether ``If-None-Match`` names any encoding variant of ``etag`` (see encoding_etag)."""
+    if not if_none_match:
+        return False
+    base = etag.strip('"')
+    for tag in if_none_match.split(","):
+        tag = tag.strip().removeprefix("W/")
+        if tag == "*" or tag.strip('"').partition("-")[0] == base:
+            return True
+    return False
+
+
+def json_response(entry: SerializedBody, if_none_match: Optional[str], accept_encoding: Optional[str] = None) -> Response:
+    encoding = body_encoding(entry.body, accept_encoding)
+    headers = {"ETag": encoding_etag(entry.etag, encoding), "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if entry.next_cursor is not None:
+        headers["X-Next-Cursor"] = entry.next_cursor
+    if etag_matches(if_none_match, entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if encoding is None:
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+    headers["Content-Encoding"] = encoding
+    body = encoded_body(entry.compressed, entry.body, encoding)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 
 async def get_db() -> AsyncIterator[AsyncSession]:
     async with get_session() as session:
         yield session
 
 
-@router.get("", response_model=List[TermOut])
-async def list_terms(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Term).order_by(Term.title.asc()))
-    terms = result.scalars().all()
-    return terms
+async def cached_read(key: Tuple, loader: Callable[[AsyncSession], Awaitable[Optional[T]]]) -> Optional[T]:
+    """Serve ``key`` from the read cache, or load it once for all concurrent callers.
+
+    The flight key includes the cache version, so a request arriving after a
+    write never joins a query that started before it.
+    """
+    value = terms_cache.get(key)
+    if value is not None:
+        return value
+    version = terms_cache.version
+
+    async def load() -> Optional[T]:
+        async with get_session() as session:
+            loaded = await loader(session)
+        if loaded is not None:
+            terms_cache.set(key, loaded, version)
+        return loaded
+
+    return await read_flight.do((version, key), load)
+
+
+async def after_write(
+    db: AsyncSession,
+    upserted: Iterable[Tuple[str, str]] = (),
+    deleted: Iterable[str] = (),
+) -> None:
+    """Log the terms written by ``db``'s transaction and schedule post-commit bookkeeping."""
+    upserted = list(upserted)
+    deleted = list(deleted)
+    await record_changes(db, upserted=[keyword for keyword, _ in upserted], deleted=deleted)
+
+    def apply() -> None:
+        terms_cache.invalidate()
+        for keyword in deleted:
+            suggest_index.remove(keyword)
+        for keyword, title in upserted:
+            suggest_index.add(keyword, title)
+        change_notifier.notify()
+
+    on_commit(db, apply)
+
+
+@router.get(
+    "",
+    response_model=Union[List[TermOut], TermMultiGet],
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Список не изменился (If-None-Match)"}},
+)
+async def list_terms(
+    keywords: Optional[str] = Query(
+        None,
+        description=f"До {MAX_MULTI_GET} keyword через запятую: вернет {{items, missing}} вместо списка",
+    ),
+    limit: Optional[int] = Query(
+        None, ge=1, le=MAX_PAGE_SIZE, description="Размер страницы; следующий cursor придет в заголовке X-Next-Cursor"
+    ),
+    cursor: Optional[str] = Query(None, description="Значение X-Next-Cursor из предыдущего ответа"),
+    fields: Optional[str] = Query(None, description="Список полей через запятую, например keyword,title"),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None, include_in_schema=False),
+):
+    if keywords is not None:
+        if limit is not None or cursor is not None or fields is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="keywords нельзя сочетать с limit, cursor и fields",
+            )
+        requested = parse_keywords(keywords)
+        entry = await cached_read(("multi", tuple(requested)), partial(load_terms_by_keywords, keywords=requested))
+        return json_response(entry, if_none_match, accept_encoding)
+    after = decode_cursor(cursor) if cursor is not None else None
+    projection = parse_fields(fields)
+    entry = await cached_read(
+        ("list", limit, after, projection),
+        partial(load_term_list, limit=limit, after=after, fields=projection),
+    )
+    return json_response(entry, if_none_match, accept_encoding)
+
+
+async def load_term(db: AsyncSession, keyword: str) -> Optional[SerializedBody]:
+    bodies = await load_term_bodies(db, [keyword])
+    return make_body(bodies[keyword]) if keyword in bodies else None
+
+
+async def load_term_bodies(db: AsyncSession, keywords: List[str]) -> Dict[str, bytes]:
+    if settings.fast_read_path:
+        result = await db.execute(select(*TERM_COLUMNS).where(Term.keyword.in_(keywords)))
+        return {row.keyword: serialize_row(row) for row in result}
+    result = await db.execute(select(Term).where(Term.keyword.in_(keywords)))
+    return {
+        term.keyword: _term_adapter.dump_json(_term_adapter.validate_python(term, from_attributes=True))
+        for term in result.scalars()
+    }
+
+
+def parse_keywords(keywords: str) -> List[str]:
+    requested = list(dict.fromkeys(k.strip() for k in keywords.split(",") if k.strip()))
+    if not requested or len(requested) > MAX_MULTI_GET:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"keywords: от 1 до {MAX_MULTI_GET} значений через запятую",
+        )
+    return requested
+
+
+async def load_terms_by_keywords(db: AsyncSession, keywords: List[str]) -> SerializedBody:
+    found: Dict[str, bytes] = {}
+    for keyword in keywords:
+        cached = terms_cache.get(("term", keyword))
+        if cached is not None:
+            found[keyword] = cached.body
+    pending = [keyword for keyword in keywords if keyword not in found]
+    if pending:
+        version = terms_cache.version
+        for keyword, body in (await load_term_bodies(db, pending)).items():
+            found[keyword] = body
+            terms_cache.set(("term", keyword), make_body(body), version)
+    # Splice the per-term bodies into the TermMultiGet JSON layout.
+    items = b",".join(found[keyword] for keyword in keywords if keyword in found)
+    missing = _keyword_list_adapter.dump_json([keyword for keyword in keywords if keyword not in found])
+    return make_body(b'{"items":[' + items + b'],"missing":' + missing + b"}")
+
+
+async def export_ndjson() -> AsyncIterator[bytes]:
+    # The response outlives get_db(), so the generator owns its session.
+    stmt = select(*TERM_COLUMNS).order_by(Term.id.asc()).execution_options(yield_per=EXPORT_BATCH_SIZE)
+    async with get_session() as session:
+        result = await session.stream(stmt)
+        async for rows in result.partitions():
+            yield b"".join(_row_adapter.dump_json(row._asdict()) + b"\n" for row in rows)
+
+
+async def read_ndjson_lines(request: Request) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """Split the request body into lines as it arrives.
+
+    Only the newly received chunk is searched for newlines, and a line longer
+    than MAX_IMPORT_LINE bytes is not buffered: it is discarded up to its end
+    and yielded as None.
+    """
+    buffer = bytearray()
+    too_long = False
+    line_no = 0
+    async for chunk in request.stream():
+        view = memoryview(chunk)
+        start = 0
+        while (end := chunk.find(b"\n", start)) != -1:
+            line_no += 1
+            if too_long or len(buffer) + end - start > MAX_IMPORT_LINE:
+                yield line_no, None
+            else:
+                buffer += view[start:end]
+                yield line_no, bytes(buffer)
+            buffer.clear()
+            too_long = False
+            start = end + 1
+        if not too_long:
+            buffer += view[start:]
+            if len(buffer) > MAX_IMPORT_LINE:
+                too_long = True
+                buffer.clear()
+    if too_long:
+        yield line_no + 1, None
+    elif buffer:
+        yield line_no + 1, bytes(buffer)
+
+
+async def upsert_terms(db: AsyncSession, items: List[Dict[str, Any]]) -> None:
+    stmt = upsert(Term)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Term.keyword],
+        set_={
+            "title": stmt.excluded.title,
+            "description": stmt.excluded.description,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    await db.execute(stmt, items)
+    await after_write(db, upserted=[(item["keyword"], item["title"]) for item in items])
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={status.HTTP_200_OK: {"content": {"application/x-ndjson": {}}}},
+)
+async def export_terms():
+    return StreamingResponse(export_ndjson(), media_type="application/x-ndjson")
+
+
+@router.post(
+    "/import",
+    response_model=ImportResult,
+    openapi_extra={"requestBody": {"content": {"application/x-ndjson": {"schema": TermCreate.model_json_schema()}}}},
+)
+async def import_terms(request: Request):
+    imported = 0
+    batch: List[Dict[str, Any]] = []
+    errors: List[ImportLineError] = []
+    async for line_no, line in read_ndjson_lines(request):
+        if line is None:
+            if len(errors) < MAX_IMPORT_ERRORS:
+                errors.append(ImportLineError(line=line_no, detail=f"Строка длиннее {MAX_IMPORT_LINE} байт"))
+            continue
+        if not line.strip():
+            continue
+        try:
+            batch.append(TermCreate.model_validate_json(line).model_dump())
+        except ValidationError as exc:
+            if len(errors) < MAX_IMPORT_ERRORS:
+                errors.append(ImportLineError(line=line_no, detail=str(exc.errors(include_url=False)[0]["msg"])))
+            continue
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            await writer.submit(partial(upsert_terms, items=batch))
+            imported += len(batch)
+            batch = []
+    if batch:
+        await writer.submit(partial(upsert_terms, items=batch))
+        imported += len(batch)
+    return ImportResult(imported=imported, errors=errors)
+
+
+@router.get("/search", response_model=List[TermSearchHit])
+async def search(
+    q: str = Query(..., min_length=1, max_length=256, description="Поисковый запрос по title и description"),
+    limit: int = Query(20, ge=1, le=100),
+):
+    if not search_supported():
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail="Полнотекстовый поиск доступен только для SQLite")
+    return await cached_read(("search", q, limit), partial(search_terms, q=q, limit=limit))
+
+
+@router.get("/suggest", response_model=List[TermSuggestion])
+async def suggest(
+    prefix: str = Query(..., min_length=1, max_length=128, description="Начало keyword или title"),
+    limit: int = Query(10, ge=1, le=50),
+):
+    await suggest_index_ready()
+    return [TermSuggestion(keyword=keyword, title=title) for keyword, title in suggest_index.suggest(prefix, limit)]
+
+
+@router.get("/changes", response_model=ChangeFeed)
+async def list_changes(
+    since: int = Query(0, ge=0, le=MAX_CHANGE_VERSION, description="version из предыдущего ответа; 0 — с самого начала"),
+    limit: int = Query(100, ge=1, le=MAX_CHANGES_PAGE),
+    db: AsyncSession = Depends(get_db),
+):
+    return await load_changes(db, since, limit)
+
+
+async def change_events(since: int) -> AsyncIterator[str]:
+    while True:
+        waiter = change_notifier.waiter()
+        async with get_session() as session:
+            feed = await load_changes(session, since, MAX_CHANGES_PAGE)
+        for change in feed.changes:
+            yield f"id: {change.version}\nevent: change\ndata: {change.model_dump_json()}\n\n"
+        since = feed.version
+        if feed.has_more:
+            continue
+        try:
+            await asyncio.wait_for(waiter.wait(), SSE_HEARTBEAT_SECONDS)
+        except asyncio.TimeoutError:
+            yield ": keep-alive\n\n"
+
+
+@router.get(
+    "/changes/stream",
+    response_class=StreamingResponse,
+    responses={status.HTTP_200_OK: {"content": {"text/event-stream": {}}}},
+)
+async def stream_changes(
+    since: int = Query(0, ge=0, le=MAX_CHANGE_VERSION),
+    last_event_id: Optional[int] = Header(
+        None, ge=0, le=MAX_CHANGE_VERSION, description="Передается EventSource автоматически при переподключении"
+    ),
+):
+    start = last_event_id if last_event_id is not None else since
+    return StreamingResponse(
+        change_events(start),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_create_terms(payload: TermBulkCreate):
+    stmt = upsert(Term).on_conflict_do_nothing(index_elements=[Term.keyword]).returning(*TERM_COLUMNS)
+    rows = [item.model_dump() for item in payload.items]
+
+    async def op(db: AsyncSession) -> BulkResult:
+        created = {row.keyword: row._asdict() for row in await db.execute(stmt, rows)}
+        if created:
+            await after_write(db, upserted=[(keyword, term["title"]) for keyword, term in created.items()])
+        results = []
+        for item in payload.items:
+            # A keyword repeated within the payload is only created once.
+            term = created.pop(item.keyword, None)
+            if term is None:
+                results.append(BulkItemResult(
+                    keyword=item.keyword,
+                    status=status.HTTP_409_CONFLICT,
+                    detail="Термин с таким keyword уже существует",
+                ))
+            else:
+                results.append(BulkItemResult(keyword=item.keyword, status=status.HTTP_201_CREATED, item=term))
+        return BulkResult(results=results)
+
+    return await writer.submit(op)
+
+
+@router.patch("/bulk", response_model=BulkResult)
+async def bulk_update_terms(payload: TermBulkUpdate):
+    keywords = [item.keyword for item in payload.items]
+    table = Term.__table__
+    # NULL parameters keep the current value, so one executemany statement
+    # covers items that set different subsets of fields.
+    stmt = (
+        update(table)
+        .where(table.c.keyword == bindparam("b_keyword"))
+        .values(
+            title=func.coalesce(bindparam("b_title"), table.c.title),
+            description=func.coalesce(bindparam("b_description"), table.c.description),
+        )
+    )
+
+    async def op(db: AsyncSession) -> BulkResult:
+        result = await db.execute(select(table.c.keyword).where(table.c.keyword.in_(keywords)))
+        found = set(result.scalars())
+        params = [
+            {"b_keyword": item.keyword, "b_title": item.title, "b_description": item.description}
+            for item in payload.items
+            if item.keyword in found
+        ]
+        terms = {}
+        if params:
+            await db.execute(stmt, params)
+            result = await db.execute(select(*TERM_COLUMNS).where(table.c.keyword.in_(found)))
+            terms = {row.keyword: row._asdict() for row in result}
+            await after_write(db, upserted=[(keyword, term["title"]) for keyword, term in terms.items()])
+        return BulkResult(results=[
+            BulkItemResult(keyword=item.keyword, status=status.HTTP_200_OK, item=terms[item.keyword])
+            if item.keyword in terms
+            else BulkItemResult(keyword=item.keyword, status=status.HTTP_404_NOT_FOUND, detail="Термин не найден")
+            for item in payload.items
+        ])
+
+    return await writer.submit(op)
+
+
+@router.delete("/bulk", response_model=BulkResult)
+async def bulk_delete_terms(payload: TermBulkDelete):
+    stmt = delete(Term.__table__).where(Term.keyword.in_(payload.keywords)).returning(Term.keyword)
+
+    async def op(db: AsyncSession) -> BulkResult:
+        deleted = set((await db.execute(stmt)).scalars())
+        if deleted:
+            await after_write(db, deleted=deleted)
+        results = []
+        for keyword in payload.keywords:
+            if keyword in deleted:
+                deleted.discard(keyword)
+                results.append(BulkItemResult(keyword=keyword, status=status.HTTP_204_NO_CONTENT))
+            else:
+                results.append(BulkItemResult(keyword=keyword, status=status.HTTP_404_NOT_FOUND, detail="Термин не найден"))
+        return BulkResult(results=results)
+
+    return await writer.submit(op)
 
 
 @router.get("/{keyword}", response_model=TermOut)
-async def get_term(keyword: str, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Term).where(Term.keyword == keyword))
-    term = result.scalar_one_or_none()
-    if not term:
+async def get_term(
+    keyword: str,
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None, include_in_schema=False),
+):
+    entry = await cached_read(("term", keyword), partial(load_term, keyword=keyword))
+    if entry is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Термин не найден")
-    return term
+    return json_response(entry, if_none_match, accept_encoding)
 
 
 @router.post("", response_model=TermOut, status_code=status.HTTP_201_CREATED)
-async def create_term(payload: TermCreate, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Term).where(Term.keyword == payload.keyword))
-    exists = result.scalar_one_or_none()
-    if exists:
-        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Термин с таким keyword уже существует")
-    term = Term(**payload.model_dump())
-    db.add(term)
-    await db.flush()
-    await db.refresh(term)
-    return term
+async def create_term(payload: TermCreate):
+    # INSERT ... ON CONFLICT DO NOTHING RETURNING: no row back means the
+    # keyword is taken, without a check-then-insert race.
+    stmt = (
+        upsert(Term)
+        .values(**payload.model_dump())
+        .on_conflict_do_nothing(index_elements=[Term.keyword])
+        .returning(*TERM_COLUMNS)
+    )
+
+    async def op(db: AsyncSession) -> TermOut:
+        row = (await db.execute(stmt)).first()
+        if row is None:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Термин с таким keyword уже существует")
+        await after_write(db, upserted=[(row.keyword, row.title)])
+        return TermOut.model_validate(row._asdict())
+
+    return await writer.submit(op)
 
 
 @router.put("/{keyword}", response_model=TermOut)
-async def update_term(keyword: str, payload: TermUpdate, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Term).where(Term.keyword == keyword))
-    term = result.scalar_one_or_none()
-    if not term:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Термин не найден")
+async def update_term(keyword: str, payload: TermUpdate):
     data = payload.model_dump(exclude_unset=True)
-    for k, v in data.items():
-        setattr(term, k, v)
-    await db.flush()
-    await db.refresh(term)
-    return term
+    if data:
+        stmt = (
+            update(Term)
+            .where(Term.keyword == keyword)
+            .values(**data)
+            .returning(*TERM_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+    else:
+        stmt = select(*TERM_COLUMNS).where(Term.keyword == keyword)
+
+    async def op(db: AsyncSession) -> TermOut:
+        row = (await db.execute(stmt)).first()
+        if row is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Термин не найден")
+        if data:
+            await after_write(db, upserted=[(row.keyword, row.title)])
+        return TermOut.model_validate(row._asdict())
+
+    return await writer.submit(op)
 
 
 @router.delete("/{keyword}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_term(keyword: str, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Term).where(Term.keyword == keyword))
-    term = result.scalar_one_or_none()
-    if not term:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Термин не найден")
-    await db.delete(term)
-    await db.flush()
+async def delete_term(keyword: str):
+    stmt = (
+        delete(Term)
+        .where(Term.keyword == keyword)
+        .returning(Term.id)
+        .execution_options(synchronize_session=False)
+    )
+
+    async def op(db: AsyncSession) -> None:
+        if (await db.execute(stmt)).first() is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Термин не найден")
+        await after_write(db, deleted=[keyword])
+
+    await writer.submit(op)
     return None
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from typing import List, Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
+
+MAX_BULK_ITEMS = 500
+
+# Fixed sub-routes of /terms: a term with one of these keywords could not be
+# read, updated or deleted through /terms/{keyword}.
+RESERVED_KEYWORDS = frozenset({"bulk", "changes", "export", "import", "search", "suggest"})
 
 
 class TermBase(BaseModel):
@@ -13,7 +19,12 @@ class TermBase(BaseModel):
 
 
 class TermCreate(TermBase):
-    pass
+    @field_validator("keyword")
+    @classmethod
+    def keyword_not_reserved(cls, value: str) -> str:
+        if value in RESERVED_KEYWORDS:
+            raise ValueError(f"keyword {value!r} зарезервирован под служебный маршрут /terms/{value}")
+        return value
 
 
 class TermUpdate(BaseModel):
@@ -28,3 +39,72 @@ class TermOut(TermBase):
 
     class Config:
         from_attributes = True
+
+
+class TermMultiGet(BaseModel):
+    items: List[TermOut]
+    missing: List[str] = Field(..., description="Запрошенные keyword, которых нет в глоссарии")
+
+
+class TermSearchHit(BaseModel):
+    keyword: str
+    title: str
+    highlighted_title: str = Field(..., description="HTML: экранированный заголовок с совпадениями в <mark>…</mark>")
+    snippet: str = Field(..., description="HTML: экранированный фрагмент описания с совпадениями в <mark>…</mark>")
+    score: float = Field(..., description="Релевантность BM25 (больше — лучше)")
+
+
+class TermSuggestion(BaseModel):
+    keyword: str
+    title: str
+
+
+class TermChangeOut(BaseModel):
+    version: int
+    op: Literal["upsert", "delete"]
+    keyword: str
+    changed_at: datetime
+    term: Optional[TermOut] = Field(None, description="Текущее состояние термина; null для удаления")
+
+
+class ChangeFeed(BaseModel):
+    version: int = Field(..., description="Передайте как since в следующем запросе")
+    has_more: bool
+    changes: List[TermChangeOut]
+
+
+class TermBulkUpdateItem(TermUpdate):
+    keyword: str = Field(..., min_length=1, max_length=128)
+
+
+class TermBulkCreate(BaseModel):
+    items: List[TermCreate] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class TermBulkUpdate(BaseModel):
+    items: List[TermBulkUpdateItem] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class TermBulkDelete(BaseModel):
+    keywords: List[str] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class BulkItemResult(BaseModel):
+    keyword: str
+    status: int = Field(..., description="HTTP-статус, который вернул бы одиночный запрос")
+    detail: Optional[str] = None
+    item: Optional[TermOut] = None
+
+
+class BulkResult(BaseModel):
+    results: List[BulkItemResult]
+
+
+class ImportLineError(BaseModel):
+    line: int
+    detail: str
+
+
+class ImportResult(BaseModel):
+    imported: int = Field(..., description="Количество созданных или обновленных терминов")
+    errors: List[ImportLineError] = Field(default_factory=list, description="Отклоненные строки (не более 100)")
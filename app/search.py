@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import html
+import re
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from .database import IS_SQLITE
+
+
+# External-content FTS5 index over terms. unicode61 splits and case-folds
+# Cyrillic as well as Latin text. Triggers keep the index in sync with every
+# write to terms, including seed_terms and bulk/import.
+FTS_SCHEMA = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS terms_fts USING fts5(
+        keyword, title, description,
+        content='terms', content_rowid='id',
+        tokenize='unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS terms_fts_ai AFTER INSERT ON terms BEGIN
+        INSERT INTO terms_fts(rowid, keyword, title, description)
+        VALUES (new.id, new.keyword, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS terms_fts_ad AFTER DELETE ON terms BEGIN
+        INSERT INTO terms_fts(terms_fts, rowid, keyword, title, description)
+        VALUES ('delete', old.id, old.keyword, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS terms_fts_au AFTER UPDATE ON terms BEGIN
+        INSERT INTO terms_fts(terms_fts, rowid, keyword, title, description)
+        VALUES ('delete', old.id, old.keyword, old.title, old.description);
+        INSERT INTO terms_fts(rowid, keyword, title, description)
+        VALUES (new.id, new.keyword, new.title, new.description);
+    END
+    """,
+)
+
+SEARCH_SQL = text(
+    """
+    SELECT t.keyword,
+           t.title,
+           highlight(terms_fts, 1, :mark_open, :mark_close) AS highlighted_title,
+           snippet(terms_fts, 2, :mark_open, :mark_close, '…', 16) AS snippet,
+           -bm25(terms_fts, 10.0, 5.0, 1.0) AS score
+    FROM terms_fts
+    JOIN terms AS t ON t.id = terms_fts.rowid
+    WHERE terms_fts MATCH :query
+    ORDER BY bm25(terms_fts, 10.0, 5.0, 1.0)
+    LIMIT :limit
+    """
+)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# FTS5 delimits matches with control characters rather than <mark>: the
+# stored text is HTML-escaped first and only then are they turned into tags.
+_MARK_OPEN = "\x02"
+_MARK_CLOSE = "\x03"
+
+
+def search_supported() -> bool:
+    return IS_SQLITE
+
+
+async def create_search_index(conn: AsyncConnection) -> None:
+    """Create the FTS5 table and triggers, indexing existing rows on first run."""
+    if not search_supported():
+        return
+    exists = await conn.exec_driver_sql("SELECT 1 FROM sqlite_master WHERE name = 'terms_fts'")
+    created = exists.first() is None
+    for ddl in FTS_SCHEMA:
+        await conn.exec_driver_sql(ddl)
+    if created:
+        await conn.exec_driver_sql("INSERT INTO terms_fts(terms_fts) VALUES ('rebuild')")
+
+
+def build_match_query(q: str) -> str:
+    """Turn free user input into a safe FTS5 query: every word is a quoted prefix term."""
+    # No stemming in unicode61, so prefixes let "паттерн" match "паттернов".
+    return " ".join(f'"{token}"*' for token in _TOKEN_RE.findall(q))
+
+
+def mark_matches(fragment: str) -> str:
+    """HTML-escape a highlighted fragment and wrap its matches in <mark>."""
+    return html.escape(fragment).replace(_MARK_OPEN, "<mark>").replace(_MARK_CLOSE, "</mark>")
+
+
+async def search_terms(db: AsyncSession, q: str, limit: int) -> List[dict]:
+    query = build_match_query(q)
+    if not query:
+        return []
+    params = {"query": query, "limit": limit, "mark_open": _MARK_OPEN, "mark_close": _MARK_CLOSE}
+    hits = []
+    for row in await db.execute(SEARCH_SQL, params):
+        hit = row._asdict()
+        hit["highlighted_title"] = mark_matches(hit["highlighted_title"])
+        hit["snippet"] = mark_matches(hit["snippet"])
+        hits.append(hit)
+    return hits
@@ -2,9 +2,10 @@ from __future__ import annotations
 
 from typing import List
 
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from .changes import record_changes
+from .database import upsert
 from .models import Term
 
 
@@ -92,9 +93,12 @@ TERMS: List[dict] = [
 
 
 async def seed_terms(session: AsyncSession) -> None:
-    result = await session.execute(select(Term.keyword))
-    existing = {k for (k,) in result.all()}
-    for term in TERMS:
-        if term["keyword"] not in existing:
-            session.add(Term(**term))
-    await session.flush()
+    """Insert the TERMS that are missing; existing rows, edited or not, are left alone."""
+    stmt = (
+        upsert(Term)
+        .values(TERMS)
+        .on_conflict_do_nothing(index_elements=[Term.keyword])
+        .returning(Term.keyword)
+    )
+    inserted = (await session.execute(stmt)).scalars().all()
+    await record_changes(session, upserted=inserted)
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from .changes import DELETE, head_version, load_changes
+from .database import get_session
+from .models import Term
+
+
+_SEPARATOR = "\x00"
+
+
+class PrefixIndex:
+    """Sorted in-memory index over keywords and titles for type-ahead lookups.
+
+    Each term contributes two entries, ``"<casefolded keyword>\\0<keyword>"``
+    and ``"<casefolded title>\\0<keyword>"``, to one sorted list. A lookup is
+    a bisect to the first entry with the prefix followed by a short forward
+    scan, so no query touches the database.
+    """
+
+    def __init__(self) -> None:
+        self._entries: List[str] = []
+        self._titles: Dict[str, str] = {}
+        # Change-log version the index is known to include (see sync_suggest_index).
+        self.version = 0
+        self.load_ms: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    @staticmethod
+    def _keys(keyword: str, title: str) -> Tuple[str, ...]:
+        return tuple({f"{keyword.casefold()}{_SEPARATOR}{keyword}", f"{title.casefold()}{_SEPARATOR}{keyword}"})
+
+    def load(self, terms: Iterable[Tuple[str, str]]) -> None:
+        titles = dict(terms)
+        self._entries = sorted(key for keyword, title in titles.items() for key in self._keys(keyword, title))
+        self._titles = titles
+
+    def add(self, keyword: str, title: str) -> None:
+        self.remove(keyword)
+        for key in self._keys(keyword, title):
+            insort(self._entries, key)
+        self._titles[keyword] = title
+
+    def remove(self, keyword: str) -> None:
+        title = self._titles.pop(keyword, None)
+        if title is None:
+            return
+        for key in self._keys(keyword, title):
+            i = bisect_left(self._entries, key)
+            if i < len(self._entries) and self._entries[i] == key:
+                del self._entries[i]
+
+    def suggest(self, prefix: str, limit: int) -> List[Tuple[str, str]]:
+        prefix = prefix.casefold().replace(_SEPARATOR, "")
+        found: Dict[str, str] = {}
+        for i in range(bisect_left(self._entries, prefix), len(self._entries)):
+            entry = self._entries[i]
+            if not entry.startswith(prefix):
+                break
+            keyword = entry.rsplit(_SEPARATOR, 1)[1]
+            found.setdefault(keyword, self._titles[keyword])
+            if len(found) >= limit:
+                break
+        return list(found.items())
+
+
+suggest_index = PrefixIndex()
+
+
+_load_task: Optional[asyncio.Task] = None
+
+
+async def load_suggest_index() -> None:
+    async with get_session() as session:
+        version = await head_version(session)
+        result = await session.execute(select(Term.keyword, Term.title))
+        suggest_index.load(result.tuples().all())
+        suggest_index.version = version
+
+
+async def _load_in_background() -> None:
+    started = time.perf_counter()
+    await load_suggest_index()
+    # Writes committed while the snapshot was being indexed updated the old
+    # index in place and were lost by load(); replay them from the change log.
+    await _apply_changes()
+    suggest_index.load_ms = round((time.perf_counter() - started) * 1000, 3)
+
+
+def start_loading_suggest_index() -> None:
+    """Build the index in the background so startup time does not grow with the table."""
+    global _load_task
+    _load_task = asyncio.create_task(_load_in_background(), name="glossary-suggest-index")
+
+
+async def stop_loading_suggest_index(timeout: float = 5.0) -> None:
+    """Let a running load finish before shutdown; cancel it only after ``timeout``.
+
+    Cancelling mid-query interrupts the session's rollback and SQLAlchemy
+    logs the CancelledError while resetting the connection.
+    """
+    if _load_task is not None and not _load_task.done():
+        await asyncio.wait({_load_task}, timeout=timeout)
+    if _load_task is not None and not _load_task.done():
+        _load_task.cancel()
+        try:
+            await _load_task
+        except asyncio.CancelledError:
+            pass
+
+
+async def suggest_index_ready() -> None:
+    """Wait for the background load, if any; re-raises its error."""
+    if _load_task is not None:
+        await asyncio.shield(_load_task)
+
+
+async def sync_suggest_index() -> None:
+    """Apply change-log entries committed by other processes since the last sync."""
+    await suggest_index_ready()
+    await _apply_changes()
+
+
+async def _apply_changes() -> None:
+    async with get_session() as session:
+        while True:
+            feed = await load_changes(session, suggest_index.version, 1000)
+            for change in feed.changes:
+                if change.op == DELETE:
+                    suggest_index.remove(change.keyword)
+                else:
+                    suggest_index.add(change.keyword, change.term.title)
+            suggest_index.version = feed.version
+            if not feed.has_more:
+                break
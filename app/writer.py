@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .database import get_session, write_connection
+from .profiling import RequestProfile, current_profile, phase, use_profile
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RECONNECT_DELAY = 1.0
+WriteOp = Callable[[AsyncSession], Awaitable[Any]]
+
+
+class _Job(NamedTuple):
+    op: WriteOp
+    future: "asyncio.Future[Any]"
+    enqueued_at: float
+    # The submitting request's profile: the op runs in the writer task, whose
+    # context is not the request's.
+    profile: Optional[RequestProfile] = None
+
+
+class WriteQueue:
+    """Serializes all database writes through one connection.
+
+    SQLite allows a single writer at a time; letting every request commit on
+    its own pooled connection turns contention into ``database is locked``
+    errors. Handlers ``submit()`` an ``op(session)`` coroutine instead, a
+    single task executes the ops one by one in their own transaction, and the
+    caller awaits the op's result or exception.
+
+    With ``group_max > 1`` (group commit) ops that arrive within
+    ``group_window`` seconds are applied in one transaction, each inside its
+    own SAVEPOINT: a failing op is rolled back alone and only its caller gets
+    the error. Results are delivered only after the shared COMMIT succeeds.
+    """
+
+    def __init__(self, group_max: int = 1, group_window: float = 0.0) -> None:
+        self.group_max = group_max
+        self.group_window = group_window
+        self._queue: "asyncio.Queue[_Job]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.completed = 0
+        self.failed = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="glossary-writer")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        while not self._queue.empty():
+            job = self._queue.get_nowait()
+            if not job.future.done():
+                job.future.set_exception(RuntimeError("Write queue is shut down"))
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def submit(self, op: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        if not self.running:
+            raise RuntimeError("Write queue is not running")
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(_Job(op, future, time.perf_counter(), current_profile()))
+        return await future
+
+    async def _run(self) -> None:
+        while True:
+            jobs: List[_Job] = []
+            try:
+                async with write_connection() as conn:
+                    while True:
+                        jobs = await self._next_batch()
+                        now = time.perf_counter()
+                        for job in jobs:
+                            wait = now - job.enqueued_at
+                            self.wait_total += wait
+                            self.wait_max = max(self.wait_max, wait)
+                            if job.profile is not None:
+                                job.profile.add("write_queue", wait)
+                        jobs = [job for job in jobs if not job.future.cancelled()]
+                        if jobs:
+                            self.batches += 1
+                            await self._execute(conn, jobs)
+                        jobs = []
+            except Exception as exc:
+                # The connection could not be opened or broke mid-batch. Fail
+                # the batch and everything queued behind it instead of leaving
+                # callers waiting, then reopen the connection.
+                logger.exception("Write connection failed; reopening in %.1f s", RECONNECT_DELAY)
+                while not self._queue.empty():
+                    jobs.append(self._queue.get_nowait())
+                for job in jobs:
+                    if not job.future.done():
+                        self.failed += 1
+                        job.future.set_exception(exc)
+                await asyncio.sleep(RECONNECT_DELAY)
+
+    async def _next_batch(self) -> List[_Job]:
+        jobs = [await self._queue.get()]
+        if self.group_max == 1:
+            return jobs
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.group_window
+        while len(jobs) < self.group_max:
+            if not self._queue.empty():
+                jobs.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                jobs.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return jobs
+
+    async def _execute(self, conn, jobs: List[_Job]) -> None:
+        outcomes = []
+        try:
+            if len(jobs) == 1:
+                # The commit is this op's alone, so it is part of its profile.
+                with use_profile(jobs[0].profile):
+                    async with get_session(bind=conn) as session:
+                        with phase("write"):
+                            outcomes.append((True, await jobs[0].op(session)))
+            else:
+                async with get_session(bind=conn) as session:
+                    callbacks = session.info.setdefault("on_commit", [])
+                    for job in jobs:
+                        registered = len(callbacks)
+                        try:
+                            with use_profile(job.profile), phase("write"):
+                                async with session.begin_nested():
+                                    outcomes.append((True, await job.op(session)))
+                        except Exception as exc:
+                            # Its SAVEPOINT was rolled back: the op's on_commit
+                            # callbacks must not run after the shared COMMIT.
+                            del callbacks[registered:]
+                            outcomes.append((False, exc))
+        except Exception as exc:
+            # The single op failed, or the shared COMMIT did: nothing was persisted.
+            outcomes = [(False, exc)] * len(jobs)
+
+        for job, (ok, value) in zip(jobs, outcomes):
+            if ok:
+                self.completed += 1
+            else:
+                self.failed += 1
+            if job.future.done():
+                continue
+            if ok:
+                job.future.set_result(value)
+            else:
+                job.future.set_exception(value)
+
+    def stats(self) -> Dict[str, Any]:
+        processed = self.completed + self.failed
+        return {
+            "running": self.running,
+            "group_commit_max": self.group_max,
+            "depth": self._queue.qsize(),
+            "batches": self.batches,
+            "avg_batch_size": round(processed / self.batches, 2) if self.batches else 0.0,
+            "completed": self.completed,
+            "failed": self.failed,
+            "wait_avg_ms": round(self.wait_total / processed * 1000, 3) if processed else 0.0,
+            "wait_max_ms": round(self.wait_max * 1000, 3),
+        }
+
+
+writer = WriteQueue(
+    group_max=settings.group_commit_max,
+    group_window=settings.group_commit_window_ms / 1000,
+)
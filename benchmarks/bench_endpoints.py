@@ -0,0 +1,314 @@
+"""
+Бенчмарк всех маршрутов /terms внутри процесса, со сравнением с базовой линией.
+
+Приложение запускается через lifespan и вызывается по ASGI-транспорту httpx,
+без сети и без uvicorn. Для каждого размера таблицы временная SQLite-база
+заполняется синтетическими терминами (на основе seed_data.TERMS), затем каждый
+сценарий выполняет --warmup запросов, которые не учитываются (холодные кеши,
+первые запросы к новой таблице), и --requests замеряемых запросов с
+параллелизмом --concurrency. Сценарии, которые отдаются из кеша чтения,
+вместо этого прогревают кеш теми же запросами, что затем замеряются: иначе
+p95 зависит от доли промахов. Все сценарии прогоняются --repeat раз, каждый
+раз на заново заполненной базе, и для каждой метрики берется медиана по
+прогонам. Печатаются пропускная способность и p50/p95/p99.
+
+Результаты сравниваются с JSON-файлом базовой линии (--baseline). Если p95
+вырос или пропускная способность упала больше чем на --threshold (доля),
+скрипт завершается с кодом 1. Изменения считаются относительно общего сдвига
+для размера таблицы (медианы по всем сценариям): скорость машины между
+запусками плавает на десятки процентов, а регрессия обычно затрагивает
+отдельные маршруты. Общий сдвиг печатается отдельно и сам считается
+регрессией, если превышает --drift-threshold: так видно замедление всех
+маршрутов сразу (например, в middleware). Если сравниваются меньше трех
+сценариев, общий сдвиг не вычитается. --save-baseline перезаписывает
+базовую линию текущими результатами.
+
+SSE-поток /terms/changes/stream не замеряется: ASGI-транспорт httpx
+буферизует ответ целиком, а поток не заканчивается.
+
+Запуск: python benchmarks/bench_endpoints.py [--sizes 100 1000 10000] [--requests 200]
+        [--warmup 20] [--repeat 3] [--concurrency 8] [--only list get] [--threshold 0.5]
+        [--drift-threshold 0.5] [--save-baseline]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+BULK_SIZE = 50
+# multi_get caches every keyword as well as the whole request; the distinct
+# requests are bounded so both fit the read cache (GLOSSARY_CACHE_MAXSIZE).
+MULTI_GET_GROUPS = 50
+IMPORT_SIZE = 100
+
+Request = Tuple[str, str, Dict[str, Any]]
+
+
+class Scenario(NamedTuple):
+    name: str
+    build: Callable[[int, int], Request]  # (table size, request number) -> method, url, httpx kwargs
+    cached: bool = False  # served from the read cache
+
+
+def seeded_keyword(i: int) -> str:
+    return f"bench-{i:06d}"
+
+
+def new_keyword(size: int, i: int) -> str:
+    return f"bench-new-{size}-{i:06d}"
+
+
+def bulk_keywords(size: int, i: int) -> List[str]:
+    return [f"bench-bulk-{size}-{i:06d}-{j:03d}" for j in range(BULK_SIZE)]
+
+
+def synthetic_terms(size: int) -> List[Dict[str, Any]]:
+    from app.seed_data import TERMS
+
+    now = datetime.utcnow()
+    return [
+        {
+            "keyword": seeded_keyword(i),
+            "title": f"{TERMS[i % len(TERMS)]['title']} #{i}",
+            "description": TERMS[i % len(TERMS)]["description"],
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(size)
+    ]
+
+
+def ndjson(size: int, i: int) -> bytes:
+    lines = (
+        json.dumps({"keyword": seeded_keyword((i * IMPORT_SIZE + j) % size), "title": f"Импорт {i}-{j}", "description": "Обновлено импортом."})
+        for j in range(IMPORT_SIZE)
+    )
+    return ("\n".join(lines) + "\n").encode()
+
+
+# Writes run after reads; create/update/delete and bulk create/patch/delete
+# operate on their own keywords, so the table is back to ``size`` rows after
+# every scenario group.
+SCENARIOS: List[Scenario] = [
+    Scenario("list", lambda size, i: ("GET", "/terms", {"params": {"limit": 100}}), cached=True),
+    Scenario(
+        "list_fields", lambda size, i: ("GET", "/terms", {"params": {"limit": 100, "fields": "keyword,title"}}), cached=True,
+    ),
+    Scenario("get", lambda size, i: ("GET", f"/terms/{seeded_keyword(i * 7919 % size)}", {}), cached=True),
+    Scenario("multi_get", lambda size, i: (
+        "GET", "/terms", {"params": {"keywords": ",".join(seeded_keyword((i % MULTI_GET_GROUPS * 10 + j) % size) for j in range(10))}},
+    ), cached=True),
+    Scenario(
+        "search", lambda size, i: ("GET", "/terms/search", {"params": {"q": ("паттерн", "анализ", "класс")[i % 3]}}), cached=True,
+    ),
+    Scenario("suggest", lambda size, i: ("GET", "/terms/suggest", {"params": {"prefix": f"bench-{i % 10}"}})),
+    Scenario("changes", lambda size, i: ("GET", "/terms/changes", {"params": {"since": i % size, "limit": 100}})),
+    Scenario("export", lambda size, i: ("GET", "/terms/export", {})),
+    Scenario("create", lambda size, i: (
+        "POST", "/terms", {"json": {"keyword": new_keyword(size, i), "title": f"Новый термин {i}", "description": "Создан бенчмарком."}},
+    )),
+    Scenario("update", lambda size, i: (
+        "PUT", f"/terms/{new_keyword(size, i)}", {"json": {"title": f"Обновленный термин {i}"}},
+    )),
+    Scenario("delete", lambda size, i: ("DELETE", f"/terms/{new_keyword(size, i)}", {})),
+    Scenario("bulk_create", lambda size, i: (
+        "POST", "/terms/bulk",
+        {"json": {"items": [{"keyword": k, "title": "Пакетный термин", "description": "Создан пакетом."} for k in bulk_keywords(size, i)]}},
+    )),
+    Scenario("bulk_update", lambda size, i: (
+        "PATCH", "/terms/bulk", {"json": {"items": [{"keyword": k, "title": "Обновлен пакетом"} for k in bulk_keywords(size, i)]}},
+    )),
+    Scenario("bulk_delete", lambda size, i: ("DELETE", "/terms/bulk", {"json": {"keywords": bulk_keywords(size, i)}})),
+    Scenario("import", lambda size, i: (
+        "POST", "/terms/import", {"content": ndjson(size, i), "headers": {"Content-Type": "application/x-ndjson"}},
+    )),
+]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--requests", type=int, default=200, help="запросов на сценарий")
+    parser.add_argument("--warmup", type=int, default=20, help="неучитываемых запросов перед замером")
+    parser.add_argument("--repeat", type=int, default=3, help="прогонов; в результат идет медиана")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--only", nargs="+", choices=[s.name for s in SCENARIOS], help="только эти сценарии")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.5, help="допустимое ухудшение, доля (0.5 = 50%%)")
+    parser.add_argument(
+        "--drift-threshold", type=float, default=0.5, help="допустимый общий сдвиг всех сценариев, доля",
+    )
+    parser.add_argument("--save-baseline", action="store_true", help="записать результаты как новую базовую линию")
+    parser.add_argument("--output", type=Path, help="сохранить результаты в JSON")
+    return parser.parse_args()
+
+
+async def seed(size: int) -> None:
+    from sqlalchemy import delete, insert
+
+    from app.cache import terms_cache
+    from app.changes import backfill_change_log
+    from app.database import write_connection
+    from app.models import Term, TermChange
+    from app.settings import settings
+    from app.suggest import load_suggest_index, suggest_index_ready
+
+    await suggest_index_ready()
+    async with write_connection() as conn, conn.begin():
+        await conn.execute(delete(Term))
+        await conn.execute(delete(TermChange))
+        await conn.execute(insert(Term), synthetic_terms(size))
+        await backfill_change_log(conn)
+    terms_cache.invalidate()
+    await load_suggest_index()
+    # The change watcher reacts to the seed's commit a poll later; let it
+    # happen before the warm-up rather than in the middle of a measurement.
+    await asyncio.sleep(min(settings.change_poll_interval_ms / 1000 * 2, 1.0))
+
+
+async def drive(client, scenario: Scenario, size: int, numbers: range, concurrency: int) -> List[float]:
+    latencies: List[float] = []
+    counter = iter(numbers)
+
+    async def worker() -> None:
+        for i in counter:
+            method, url, kwargs = scenario.build(size, i)
+            started = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                raise SystemExit(f"{scenario.name}: {method} {url} -> {response.status_code} {response.text[:200]}")
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+async def measure(client, scenario: Scenario, size: int, requests: int, warmup: int, concurrency: int) -> Dict[str, float]:
+    # Cached reads are measured against a warm cache; the rest warm up with
+    # their own request numbers, so the write scenarios still create, update
+    # and delete distinct keywords.
+    numbers = range(requests) if scenario.cached else range(requests, requests + warmup)
+    await drive(client, scenario, size, numbers, concurrency)
+    started = time.perf_counter()
+    latencies = await drive(client, scenario, size, range(requests), concurrency)
+    elapsed = time.perf_counter() - started
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(cuts[49] * 1000, 3),
+        "p95_ms": round(cuts[94] * 1000, 3),
+        "p99_ms": round(cuts[98] * 1000, 3),
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Dict[str, Dict[str, float]]]:
+    import httpx
+
+    from app.main import app
+
+    scenarios = [s for s in SCENARIOS if not args.only or s.name in args.only]
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for size in args.sizes:
+                runs: Dict[str, List[Dict[str, float]]] = {scenario.name: [] for scenario in scenarios}
+                for _ in range(args.repeat):
+                    # Reseeded every time: the write scenarios grow the change log.
+                    await seed(size)
+                    for scenario in scenarios:
+                        runs[scenario.name].append(
+                            await measure(client, scenario, size, args.requests, args.warmup, args.concurrency)
+                        )
+                results[str(size)] = {
+                    name: {metric: statistics.median(run[metric] for run in samples) for metric in samples[0]}
+                    for name, samples in runs.items()
+                }
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, Dict[str, float]]],
+    baseline: Optional[Dict[str, Dict[str, Dict[str, float]]]],
+    threshold: float,
+    drift_threshold: float,
+) -> List[str]:
+    print(f"{'rows':>6} {'scenario':<12} {'req/s':>9} {'p50, ms':>9} {'p95, ms':>9} {'p99, ms':>9}  vs baseline")
+    regressions = []
+    for size, scenarios in results.items():
+        base = {
+            name: (baseline or {}).get(size, {}).get(name)
+            for name in scenarios
+        }
+        compared = [name for name, entry in base.items() if entry and entry["p95_ms"] and entry["rps"]]
+        p95_ratios = {name: scenarios[name]["p95_ms"] / base[name]["p95_ms"] for name in compared}
+        rps_ratios = {name: scenarios[name]["rps"] / base[name]["rps"] for name in compared}
+        # The shift shared by every scenario of this size is the machine (or
+        # something every route goes through); with fewer than three
+        # scenarios it cannot be told apart from the scenarios themselves.
+        normalized = len(compared) >= 3
+        p95_drift = statistics.median(p95_ratios.values()) if normalized else 1.0
+        rps_drift = statistics.median(rps_ratios.values()) if normalized else 1.0
+        for name, current in scenarios.items():
+            note = ""
+            if name in compared:
+                p95_change = p95_ratios[name] / p95_drift - 1
+                rps_change = rps_ratios[name] / rps_drift - 1
+                note = f"p95 {p95_change:+.0%}, req/s {rps_change:+.0%}"
+                if p95_change > threshold or rps_change < -threshold:
+                    note += "  РЕГРЕССИЯ"
+                    regressions.append(f"{name} @ {size}: {note}")
+            print(
+                f"{size:>6} {name:<12} {current['rps']:>9.1f} {current['p50_ms']:>9.2f} "
+                f"{current['p95_ms']:>9.2f} {current['p99_ms']:>9.2f}  {note}"
+            )
+        if normalized:
+            note = f"p95 {p95_drift - 1:+.0%}, req/s {rps_drift - 1:+.0%}"
+            if p95_drift - 1 > drift_threshold or rps_drift - 1 < -drift_threshold:
+                note += "  РЕГРЕССИЯ"
+                regressions.append(f"все сценарии @ {size}: {note}")
+            print(f"{size:>6} {'(общий сдвиг)':<12} {note}")
+    return regressions
+
+
+def main() -> None:
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["GLOSSARY_DATABASE_URL"] = f"sqlite+aiosqlite:///{tmp}/bench.db"
+        results = asyncio.run(run(args))
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2, ensure_ascii=False) + "\n")
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2, ensure_ascii=False) + "\n")
+        compare(results, None, args.threshold, args.drift_threshold)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else None
+    regressions = compare(results, baseline, args.threshold, args.drift_threshold)
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
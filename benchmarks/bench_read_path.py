@@ -0,0 +1,88 @@
+"""
+Сравнение ORM-пути и быстрого Core-пути чтения списка терминов.
+
+Для каждого размера таблицы заполняет временную SQLite-базу, затем многократно
+выполняет load_term_list() с GLOSSARY_FAST_READ_PATH выключенным (ORM-объекты +
+валидация TermOut) и включенным (строки Core + прямая сериализация в JSON),
+проверяет, что ответы совпадают байт в байт, и печатает время и ускорение.
+
+Запуск: python benchmarks/bench_read_path.py [--sizes 10 100 1000 10000] [--repeat 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    return parser.parse_args()
+
+
+async def run(sizes, repeat: int) -> None:
+    from sqlalchemy import delete, insert
+
+    from app.database import create_all, get_session, write_connection
+    from app.models import Term
+    from app.routers import load_term_list
+    from app.settings import settings
+
+    async with write_connection() as conn, conn.begin():
+        await create_all(conn)
+
+    print(f"{'rows':>8} {'orm, ms':>10} {'fast, ms':>10} {'speedup':>8}")
+    for size in sizes:
+        now = datetime.utcnow()
+        async with get_session() as session:
+            await session.execute(delete(Term))
+            await session.execute(insert(Term), [
+                {
+                    "keyword": f"bench-{i}",
+                    "title": f"Термин для замера {i:06d}",
+                    "description": "Описание термина для нагрузочного замера. " * 8,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(size)
+            ])
+
+        timings = {}
+        bodies = {}
+        for fast in (False, True):
+            settings.fast_read_path = fast
+            samples = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                async with get_session() as session:
+                    entry = await load_term_list(session, None, None, None)
+                samples.append(time.perf_counter() - started)
+            timings[fast] = statistics.median(samples) * 1000
+            bodies[fast] = entry.body
+
+        if bodies[True] != bodies[False]:
+            raise SystemExit(f"Fast path output differs from the ORM path at {size} rows")
+        print(f"{size:>8} {timings[False]:>10.2f} {timings[True]:>10.2f} {timings[False] / timings[True]:>7.1f}x")
+
+
+def main() -> None:
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["GLOSSARY_DATABASE_URL"] = f"sqlite+aiosqlite:///{tmp}/bench.db"
+        asyncio.run(run(args.sizes, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
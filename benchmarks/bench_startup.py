@@ -0,0 +1,93 @@
+"""
+Время холодного старта в зависимости от размера таблицы.
+
+Для каждого размера готовит SQLite-базу (первый запуск приложения создает
+схему и начальные данные, затем в terms дописываются синтетические строки),
+после чего несколько раз запускает uvicorn и замеряет время от запуска
+процесса до первого успешного ответа GET /terms/design-pattern. Рядом
+печатается ready_ms и фазы старта из GET /stats. При версионированном
+bootstrap время не должно расти вместе с таблицей.
+
+Запуск: python benchmarks/bench_startup.py [--sizes 0 10000 100000] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from load_test import ROOT, free_port  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    return parser.parse_args()
+
+
+def cold_start(db_path: Path) -> tuple:
+    """Seconds from spawning uvicorn to the first 200 response, plus the server's own startup stats."""
+    port = free_port()
+    env = dict(os.environ, GLOSSARY_DATABASE_URL=f"sqlite+aiosqlite:///{db_path}")
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT,
+        env=env,
+    )
+    try:
+        while True:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/terms/design-pattern", timeout=1):
+                    elapsed = time.perf_counter() - started
+                    break
+            except OSError:
+                if process.poll() is not None:
+                    raise SystemExit("uvicorn завершился до первого ответа")
+                time.sleep(0.01)
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/stats", timeout=5) as response:
+            stats = json.load(response)["startup"]
+        return elapsed, stats
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def fill(db_path: Path, size: int) -> None:
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO terms (keyword, title, description, created_at, updated_at)"
+            " VALUES (?, ?, ?, datetime('now'), datetime('now'))",
+            ((f"bench-{i:07d}", f"Термин для замера {i}", "Описание термина для замера старта. " * 4) for i in range(size)),
+        )
+
+
+def main() -> None:
+    args = parse_args()
+    print(f"{'rows':>8} {'first response, ms':>19} {'ready_ms':>9}  phases")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = Path(tmp) / "startup.db"
+            cold_start(db_path)  # bootstrap: schema and seed
+            fill(db_path, size)
+            runs = [cold_start(db_path) for _ in range(args.repeat)]
+        elapsed = statistics.median(run[0] for run in runs) * 1000
+        ready = statistics.median(run[1]["ready_ms"] for run in runs)
+        stats = runs[-1][1]
+        print(f"{size:>8} {elapsed:>19.0f} {ready:>9.0f}  {stats['phases_ms']} schema={stats['schema']} seed={stats['seed']}")
+
+
+if __name__ == "__main__":
+    main()
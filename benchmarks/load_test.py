@@ -0,0 +1,302 @@
+"""
+Автоматический прогон нагрузочных сценариев Locust с проверкой SLO и отчетом.
+
+Для каждого сценария (light, working, stress, stability — те же параметры,
+что в LOAD_TESTING_REPORT.md) скрипт запускает uvicorn с приложением на
+свежей временной SQLite-базе, выполняет locust --headless с CSV-выгрузкой,
+проверяет SLO (минимальный RPS, p95, доля ошибок) по строке Aggregated и
+пишет REPORT.md со сравнительными таблицами в каталог результатов.
+
+Режим --ramp увеличивает число пользователей ступенями на одном экземпляре
+приложения, пока SLO не нарушится, и сообщает последнюю ступень, на которой
+они выполнялись (предел производительности).
+
+--report-only DIR только строит отчет по уже готовым CSV (например,
+load_test_results/), ничего не запуская.
+
+Запуск: python benchmarks/load_test.py [--scenarios light working] [--classes GlossaryUser WriteHeavyUser]
+        [--slo-p95-ms 100] [--slo-error-rate 0.01] [--workers 1] [--out load_test_results/auto]
+        python benchmarks/load_test.py --ramp [--ramp-start 10] [--ramp-step 20] [--ramp-max 500] [--ramp-step-time 1m]
+        python benchmarks/load_test.py --report-only load_test_results
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+LOCUSTFILE = ROOT / "locustfile.py"
+DEFAULT_CLASSES = ["GlossaryUser", "ReadOnlyUser"]
+
+
+class Scenario(NamedTuple):
+    name: str
+    prefix: str  # имя CSV/HTML, как у файлов в load_test_results/
+    title: str
+    users: int
+    spawn_rate: int
+    run_time: str
+    min_rps: float
+
+
+# Пользователь делает запрос раз в 1-3 секунды (ReadOnlyUser: 0.5-2), то есть
+# в среднем не меньше ~0.5 запроса в секунду; SLO по RPS берет 80% от этого.
+SCENARIOS: List[Scenario] = [
+    Scenario("light", "test1_light_load", "Легкая нагрузка", 10, 2, "1m", 4),
+    Scenario("working", "test2_working_load", "Рабочая нагрузка", 50, 5, "3m", 20),
+    Scenario("stress", "test3_stress_test", "Стресс-тест", 200, 20, "5m", 80),
+    Scenario("stability", "test4_stability", "Тест на стабильность", 50, 5, "10m", 20),
+]
+
+
+class Slo(NamedTuple):
+    p95_ms: float
+    error_rate: float
+    min_rps: Optional[float]  # None — брать из сценария
+
+
+class Result(NamedTuple):
+    scenario: Scenario
+    rows: List[Dict[str, str]]  # строки *_stats.csv, последняя — Aggregated
+
+    @property
+    def total(self) -> Dict[str, str]:
+        return self.rows[-1]
+
+    @property
+    def requests(self) -> int:
+        return int(self.total["Request Count"])
+
+    @property
+    def failures(self) -> int:
+        return int(self.total["Failure Count"])
+
+    @property
+    def error_rate(self) -> float:
+        return self.failures / self.requests if self.requests else 0.0
+
+    @property
+    def rps(self) -> float:
+        return float(self.total["Requests/s"])
+
+    def percentile(self, column: str) -> float:
+        value = self.total[column]
+        return float(value) if value not in ("", "N/A") else 0.0
+
+    def violations(self, slo: Slo) -> List[str]:
+        min_rps = slo.min_rps if slo.min_rps is not None else self.scenario.min_rps
+        problems = []
+        if self.rps < min_rps:
+            problems.append(f"RPS {self.rps:.1f} < {min_rps:g}")
+        if self.percentile("95%") > slo.p95_ms:
+            problems.append(f"p95 {self.percentile('95%'):g} ms > {slo.p95_ms:g} ms")
+        if self.error_rate > slo.error_rate:
+            problems.append(f"ошибки {self.error_rate:.2%} > {slo.error_rate:.2%}")
+        return problems
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=[s.name for s in SCENARIOS], default=[s.name for s in SCENARIOS])
+    parser.add_argument("--classes", nargs="+", default=DEFAULT_CLASSES, help="классы пользователей из locustfile.py")
+    parser.add_argument("--workers", type=int, default=1, help="процессы uvicorn (GLOSSARY_WORKERS)")
+    parser.add_argument("--out", type=Path, default=ROOT / "load_test_results" / "auto")
+    parser.add_argument("--slo-p95-ms", type=float, default=100.0)
+    parser.add_argument("--slo-error-rate", type=float, default=0.01, help="доля, 0.01 = 1%%")
+    parser.add_argument("--slo-min-rps", type=float, help="минимальный RPS для всех сценариев вместо значений по умолчанию")
+    parser.add_argument("--ramp", action="store_true", help="наращивать нагрузку до нарушения SLO")
+    parser.add_argument("--ramp-start", type=int, default=10)
+    parser.add_argument("--ramp-step", type=int, default=20)
+    parser.add_argument("--ramp-max", type=int, default=500)
+    parser.add_argument("--ramp-step-time", default="1m")
+    parser.add_argument("--report-only", type=Path, metavar="DIR", help="построить отчет по готовым CSV")
+    return parser.parse_args()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with urllib.request.urlopen(url, timeout=1):
+                return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise SystemExit(f"Приложение не ответило на {url} за {timeout:g} с")
+            time.sleep(0.2)
+
+
+@contextmanager
+def running_app(workers: int) -> Iterator[str]:
+    """uvicorn с приложением на свежей базе во временном каталоге; возвращает адрес."""
+    with tempfile.TemporaryDirectory() as tmp:
+        port = free_port()
+        env = dict(
+            os.environ,
+            GLOSSARY_DATABASE_URL=f"sqlite+aiosqlite:///{tmp}/glossary.db",
+            GLOSSARY_WORKERS=str(workers),
+        )
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+             "--workers", str(workers), "--log-level", "warning"],
+            cwd=ROOT,
+            env=env,
+        )
+        host = f"http://127.0.0.1:{port}"
+        try:
+            wait_until_ready(f"{host}/stats")
+            yield host
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+
+def run_locust(host: str, classes: List[str], users: int, spawn_rate: int, run_time: str, csv_prefix: Path) -> None:
+    command = [
+        sys.executable, "-m", "locust", "-f", str(LOCUSTFILE), "--host", host, "--headless", "--only-summary",
+        "--users", str(users), "--spawn-rate", str(spawn_rate), "--run-time", run_time,
+        "--csv", str(csv_prefix), "--html", f"{csv_prefix}.html", *classes,
+    ]
+    print(f"$ {' '.join(command[2:])}", flush=True)
+    # locust завершается с кодом 1, если были неудачные запросы; это решает SLO, а не код выхода.
+    subprocess.run(command, cwd=ROOT, check=False)
+
+
+def read_stats(csv_prefix: Path) -> List[Dict[str, str]]:
+    with open(f"{csv_prefix}_stats.csv", newline="") as f:
+        rows = list(csv.DictReader(f))
+    aggregated = [row for row in rows if row["Name"] == "Aggregated"]
+    return [row for row in rows if row["Name"] != "Aggregated"] + aggregated
+
+
+def run_scenarios(args: argparse.Namespace, slo: Slo) -> List[Result]:
+    results = []
+    for scenario in (s for s in SCENARIOS if s.name in args.scenarios):
+        with running_app(args.workers) as host:
+            prefix = args.out / scenario.prefix
+            run_locust(host, args.classes, scenario.users, scenario.spawn_rate, scenario.run_time, prefix)
+        result = Result(scenario, read_stats(prefix))
+        results.append(result)
+        print(f"{scenario.name}: {', '.join(result.violations(slo)) or 'SLO выполнены'}", flush=True)
+    return results
+
+
+def run_ramp(args: argparse.Namespace, slo: Slo) -> List[Result]:
+    results = []
+    with running_app(args.workers) as host:
+        for users in range(args.ramp_start, args.ramp_max + 1, args.ramp_step):
+            scenario = Scenario(
+                f"ramp-{users}", f"ramp_{users:04d}_users", f"{users} пользователей", users,
+                max(1, users // 10), args.ramp_step_time, users * 0.4,
+            )
+            prefix = args.out / scenario.prefix
+            run_locust(host, args.classes, users, scenario.spawn_rate, args.ramp_step_time, prefix)
+            result = Result(scenario, read_stats(prefix))
+            results.append(result)
+            problems = result.violations(slo)
+            print(f"{users} users: {', '.join(problems) or 'SLO выполнены'}", flush=True)
+            if problems:
+                break
+    return results
+
+
+def results_from_dir(directory: Path) -> List[Result]:
+    results = []
+    for scenario in SCENARIOS:
+        prefix = directory / scenario.prefix
+        if Path(f"{prefix}_stats.csv").exists():
+            results.append(Result(scenario, read_stats(prefix)))
+    return results
+
+
+def ms(value: str) -> str:
+    return f"{float(value):.2f}" if value not in ("", "N/A") else "—"
+
+
+def render_report(results: List[Result], slo: Slo, classes: List[str], ramp: bool) -> str:
+    lines = [
+        "# Отчет о нагрузочном тестировании (сгенерирован автоматически)",
+        "",
+        f"Дата: {datetime.now():%Y-%m-%d %H:%M}. Классы пользователей: {', '.join(classes)}.",
+        f"SLO: p95 ≤ {slo.p95_ms:g} ms, ошибки ≤ {slo.error_rate:.2%}, "
+        + (f"RPS ≥ {slo.min_rps:g}." if slo.min_rps is not None else "RPS ≥ минимума сценария."),
+        "",
+        "## Сравнение сценариев",
+        "",
+        "| Сценарий | Пользователи | Запросы | Ошибки | RPS | Median (ms) | p95 (ms) | p99 (ms) | Max (ms) | SLO |",
+        "|----------|--------------|---------|--------|-----|-------------|----------|----------|----------|-----|",
+    ]
+    for result in results:
+        problems = result.violations(slo)
+        total = result.total
+        lines.append(
+            f"| {result.scenario.title} | {result.scenario.users} | {result.requests:,} "
+            f"| {result.failures} ({result.error_rate:.2%}) | {result.rps:.2f} | {total['50%']} | {total['95%']} "
+            f"| {total['99%']} | {ms(total['Max Response Time'])} | {'✅' if not problems else '❌ ' + '; '.join(problems)} |"
+        )
+    if ramp and results:
+        passed = [r for r in results if not r.violations(slo)]
+        lines += ["", "## Предел производительности", ""]
+        if passed:
+            best = passed[-1]
+            lines.append(f"SLO выполняются до {best.scenario.users} пользователей ({best.rps:.2f} RPS, p95 {best.total['95%']} ms).")
+        else:
+            lines.append("SLO нарушены уже на первой ступени.")
+        if len(passed) == len(results):
+            lines.append("Нарушение SLO не достигнуто: увеличьте --ramp-max.")
+
+    for result in results:
+        lines += [
+            "",
+            f"## {result.scenario.title} ({result.scenario.users} пользователей, {result.scenario.run_time})",
+            "",
+            "| Эндпоинт | Запросы | Ошибки | Avg (ms) | Median (ms) | p95 (ms) | p99 (ms) | Max (ms) |",
+            "|----------|---------|--------|----------|-------------|----------|----------|----------|",
+        ]
+        for row in result.rows[:-1]:
+            lines.append(
+                f"| {row['Type']} {row['Name']} | {row['Request Count']} | {row['Failure Count']} "
+                f"| {ms(row['Average Response Time'])} | {row['50%']} | {row['95%']} | {row['99%']} | {ms(row['Max Response Time'])} |"
+            )
+    return "\n".join(lines) + "\n"
+
+
+def main() -> None:
+    args = parse_args()
+    slo = Slo(args.slo_p95_ms, args.slo_error_rate, args.slo_min_rps)
+    if args.report_only:
+        out = args.report_only
+        results = results_from_dir(out)
+        if not results:
+            raise SystemExit(f"В {out} нет файлов *_stats.csv известных сценариев")
+    else:
+        args.out.mkdir(parents=True, exist_ok=True)
+        out = args.out
+        results = run_ramp(args, slo) if args.ramp else run_scenarios(args, slo)
+
+    report = out / "REPORT.md"
+    report.write_text(render_report(results, slo, args.classes, args.ramp))
+    print(f"Отчет: {report}")
+    if not args.ramp and any(r.violations(slo) for r in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
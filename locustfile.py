@@ -206,16 +206,19 @@ class GlossaryUser(HttpUser):
         Вес: 1
         """
         fake_keyword = self._generate_random_keyword()
-        response = self.client.get(
+        with self.client.get(
             f"/terms/{fake_keyword}",
-            name="/terms/{keyword} [GET 404]"
-        )
-        stats["total_requests"] += 1
-        # 404 - это ожидаемый ответ, не считаем его ошибкой
-        if response.status_code == 404:
-            stats["successful_requests"] += 1
-        else:
-            stats["failed_requests"] += 1
+            name="/terms/{keyword} [GET 404]",
+            catch_response=True
+        ) as response:
+            stats["total_requests"] += 1
+            # 404 - это ожидаемый ответ, не считаем его ошибкой (в том числе в CSV Locust)
+            if response.status_code == 404:
+                response.success()
+                stats["successful_requests"] += 1
+            else:
+                response.failure(f"Ожидался 404, получен {response.status_code}")
+                stats["failed_requests"] += 1
 
     def _generate_random_keyword(self):
         """Генерирует случайный keyword для тестирования."""
@@ -271,3 +274,85 @@ class ReadOnlyUser(HttpUser):
                 stats["successful_requests"] += 1
             else:
                 stats["failed_requests"] += 1
+
+
+class WriteHeavyUser(HttpUser):
+    """
+    Симулирует пользователя, который в основном пишет: создает, обновляет и удаляет термины.
+    Нагружает очередь записи и блокировку SQLite; в сценарии по умолчанию не входит,
+    запускается явно: locust -f locustfile.py WriteHeavyUser (или benchmarks/load_test.py --classes ...).
+    """
+
+    wait_time = between(0.5, 1.5)
+
+    def on_start(self):
+        """Инициализирует список терминов, созданных этим пользователем."""
+        self.created_keywords = []
+
+    @task(5)
+    def create_term(self):
+        """Создание нового термина. Вес: 5"""
+        keyword = f"write_{''.join(random.choices(string.ascii_lowercase + string.digits, k=8))}"
+        payload = {
+            "keyword": keyword,
+            "title": f"Write Heavy Term {keyword}",
+            "description": f"Term created by the write-heavy scenario: {keyword}."
+        }
+        response = self.client.post("/terms", json=payload, name="/terms [CREATE] (WH)")
+        stats["total_requests"] += 1
+        if response.status_code == 201:
+            self.created_keywords.append(keyword)
+            stats["successful_requests"] += 1
+            stats["created_terms"] += 1
+        else:
+            stats["failed_requests"] += 1
+
+    @task(4)
+    def update_term(self):
+        """Обновление одного из созданных терминов. Вес: 4"""
+        if not self.created_keywords:
+            return
+        keyword = random.choice(self.created_keywords)
+        response = self.client.put(
+            f"/terms/{keyword}",
+            json={"title": f"Updated Title {random.randint(1, 1000)}"},
+            name="/terms/{keyword} [UPDATE] (WH)"
+        )
+        stats["total_requests"] += 1
+        if response.status_code == 200:
+            stats["successful_requests"] += 1
+            stats["updated_terms"] += 1
+        else:
+            stats["failed_requests"] += 1
+
+    @task(2)
+    def delete_term(self):
+        """Удаление созданного термина. Вес: 2"""
+        if not self.created_keywords:
+            return
+        keyword = self.created_keywords.pop(random.randrange(len(self.created_keywords)))
+        response = self.client.delete(f"/terms/{keyword}", name="/terms/{keyword} [DELETE] (WH)")
+        stats["total_requests"] += 1
+        if response.status_code == 204:
+            stats["successful_requests"] += 1
+            stats["deleted_terms"] += 1
+        else:
+            stats["failed_requests"] += 1
+
+    @task(1)
+    def list_terms(self):
+        """Проверка, что чтение не страдает от записи. Вес: 1"""
+        response = self.client.get("/terms", name="/terms [LIST] (WH)")
+        stats["total_requests"] += 1
+        if response.status_code == 200:
+            stats["successful_requests"] += 1
+        else:
+            stats["failed_requests"] += 1
+
+    def on_stop(self):
+        """Очистка: удаление всех терминов, созданных этим пользователем."""
+        for keyword in self.created_keywords[:]:
+            try:
+                self.client.delete(f"/terms/{keyword}")
+            except:
+                pass  # Игнорируем ошибки при очистке
@@ -0,0 +1,37 @@
+import os
+import tempfile
+
+import pytest
+
+# Settings are read when app.settings is imported: a throwaway database and
+# group commit (with a window wide enough for concurrent requests to share a
+# batch) have to be configured before any app module is imported.
+_tmp = tempfile.TemporaryDirectory()
+os.environ["GLOSSARY_DATABASE_URL"] = f"sqlite+aiosqlite:///{_tmp.name}/test.db"
+os.environ["GLOSSARY_GROUP_COMMIT_MAX"] = "8"
+os.environ["GLOSSARY_GROUP_COMMIT_WINDOW_MS"] = "50"
+# The change watcher also sees this process's own commits and invalidates the
+# cache on its own; effectively paused so only the writer's callbacks count.
+os.environ["GLOSSARY_CHANGE_POLL_INTERVAL_MS"] = "3600000"
+
+import httpx  # noqa: E402
+
+from app.database import engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+# One event loop and one app lifespan for the whole session: the writer
+# queue and other module-level asyncio objects bind to the first loop that
+# uses them.
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def client():
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
+    await engine.dispose()
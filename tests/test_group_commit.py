@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.cache import terms_cache
+from app.models import TermChange
+from app.routers import after_write
+from app.suggest import suggest_index, suggest_index_ready
+from app.writer import writer
+
+pytestmark = pytest.mark.anyio
+
+
+def term(keyword: str) -> dict:
+    return {"keyword": keyword, "title": f"Термин {keyword}", "description": "Создан тестом."}
+
+
+async def create_in_one_batch(client, keywords):
+    batches = writer.batches
+    responses = await asyncio.gather(*(client.post("/terms", json=term(keyword)) for keyword in keywords))
+    assert writer.batches == batches + 1, "the writes did not share a group commit"
+    return responses
+
+
+async def logged_keywords() -> set:
+    from app.database import get_session
+
+    async with get_session() as session:
+        return set((await session.execute(select(TermChange.keyword))).scalars())
+
+
+async def test_duplicate_keyword_fails_only_its_caller(client):
+    keywords = ["gc-one", "gc-dup", "gc-dup", "gc-two"]
+    responses = await create_in_one_batch(client, keywords)
+
+    statuses = [response.status_code for response in responses]
+    assert statuses[0] == statuses[3] == 201
+    assert sorted(statuses[1:3]) == [201, 409]
+    for keyword in ("gc-one", "gc-dup", "gc-two"):
+        assert (await client.get(f"/terms/{keyword}")).status_code == 200
+
+
+async def test_failed_op_callbacks_do_not_run(client):
+    await suggest_index_ready()
+    assert (await client.get("/terms/design-pattern")).status_code == 200
+    version = terms_cache.version
+
+    async def failing(db):
+        await after_write(db, upserted=[("gc-ghost", "Призрак")])
+        raise ValueError("op failed")
+
+    async def reading(db):
+        return (await db.execute(select(TermChange.version).limit(1))).scalar()
+
+    results = await asyncio.gather(writer.submit(failing), writer.submit(reading), return_exceptions=True)
+
+    assert isinstance(results[0], ValueError)
+    assert not isinstance(results[1], Exception)
+    assert terms_cache.version == version
+    assert suggest_index.suggest("gc-ghost", 5) == []
+    assert "gc-ghost" not in await logged_keywords()
+
+
+async def test_failed_commit_fails_every_caller(client):
+    await suggest_index_ready()
+    version = terms_cache.version
+
+    def fail_commit(session):
+        raise RuntimeError("commit failed")
+
+    event.listen(Session, "before_commit", fail_commit)
+    try:
+        responses = await create_in_one_batch(client, ["gc-lost-1", "gc-lost-2", "gc-lost-3"])
+    finally:
+        event.remove(Session, "before_commit", fail_commit)
+
+    assert [response.status_code for response in responses] == [500, 500, 500]
+    assert terms_cache.version == version
+    for keyword in ("gc-lost-1", "gc-lost-2", "gc-lost-3"):
+        assert suggest_index.suggest(keyword, 5) == []
+        assert (await client.get(f"/terms/{keyword}")).status_code == 404
+    assert not {"gc-lost-1", "gc-lost-2", "gc-lost-3"} & await logged_keywords()